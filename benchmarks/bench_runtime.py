@@ -0,0 +1,71 @@
+"""
+Compare the crawler runtime profiles against the synthetic site.
+
+Usage:
+    python -m benchmarks.site_server --pages 5000 &
+    python -m benchmarks.bench_runtime http://127.0.0.1:8080 --pages 5000
+"""
+import argparse
+import asyncio
+import statistics
+import subprocess
+import sys
+import time
+from client import SessionManager
+from main import MAX_CONCURRENT_REQUESTS, RUNTIME_PROFILES, run, runtime_session_options
+
+
+async def fetch_all(urls: list[str], session_options: dict) -> list[float]:
+    """Fetch every URL with MAX_CONCURRENT_REQUESTS workers and return per-request latencies."""
+    latencies = []
+    queue: asyncio.Queue = asyncio.Queue()
+    for url in urls:
+        queue.put_nowait(url)
+
+    async with SessionManager(max_connections=MAX_CONCURRENT_REQUESTS, **session_options) as session_manager:
+        async def worker():
+            while not queue.empty():
+                url = queue.get_nowait()
+                started = time.perf_counter()
+                await session_manager.fetch(url)
+                latencies.append(time.perf_counter() - started)
+
+        await asyncio.gather(*(worker() for _ in range(MAX_CONCURRENT_REQUESTS)))
+    return latencies
+
+
+def bench(server: str, pages: int, runtime: str) -> None:
+    """Run one profile and print pages/s and latency percentiles."""
+    profile = RUNTIME_PROFILES[runtime]
+    urls = [f"{server}/page/{n}" for n in range(pages)]
+    started = time.perf_counter()
+    session_options = runtime_session_options(runtime, MAX_CONCURRENT_REQUESTS)
+    latencies = run(fetch_all(urls, session_options), use_uvloop=profile['uvloop'])
+    elapsed = time.perf_counter() - started
+
+    quantiles = statistics.quantiles(latencies, n=100)
+    print(f"{runtime:<8} {pages / elapsed:>10.0f} {quantiles[49] * 1000:>9.1f} {quantiles[98] * 1000:>9.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the runtime profiles against a synthetic site.")
+    parser.add_argument("server", help="Base URL of benchmarks.site_server")
+    parser.add_argument("--pages", type=int, default=5000)
+    parser.add_argument("--runtime", choices=sorted(RUNTIME_PROFILES))
+    args = parser.parse_args()
+
+    if args.runtime:
+        bench(args.server, args.pages, args.runtime)
+        return
+
+    # Each profile runs in a fresh interpreter so the loop policies do not interfere
+    print(f"{'runtime':<8} {'pages/s':>10} {'p50_ms':>9} {'p99_ms':>9}")
+    for runtime in sorted(RUNTIME_PROFILES):
+        subprocess.run(
+            [sys.executable, "-m", "benchmarks.bench_runtime", args.server, "--pages", str(args.pages), "--runtime", runtime],
+            check=True
+        )
+
+
+if __name__ == "__main__":
+    main()
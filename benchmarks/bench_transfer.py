@@ -0,0 +1,120 @@
+"""
+Measure wire bytes, client CPU per page and decoding correctness against the synthetic site.
+
+Usage:
+    python -m benchmarks.bench_transfer --pages 2000
+"""
+import argparse
+import asyncio
+import socket
+import subprocess
+import sys
+import time
+from aiohttp import ClientSession
+from client import SessionManager
+from client.content_decoder import ContentDecoder
+
+# (name, site_server arguments)
+SITES = [
+    ('utf-8 identity', []),
+    ('utf-8 compressed', ['--compress']),
+    ('latin-1 header', ['--compress', '--charset', 'latin-1']),
+    ('shift_jis meta', ['--compress', '--charset', 'shift_jis', '--meta-charset']),
+]
+EXPECTED = "ページの本文"
+EXPECTED_LATIN = "Größe"
+# (client name, encodings in order of preference)
+CLIENTS = [
+    ('negotiated', ContentDecoder.ENCODINGS),
+    ('zstd-first', ('zstd', 'br', 'gzip', 'deflate')),
+]
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+async def fetch_legacy(urls: list[str]) -> tuple[list[str], int, set[str]]:
+    """
+    Fetch like the previous SessionManager: aiohttp's default Accept-Encoding and decompression, forced utf-8.
+
+    Returns:
+        The pages, the wire bytes summed from Content-Length and the Content-Encodings received
+    """
+    wire_bytes = 0
+    encodings = set()
+    async with ClientSession() as session:
+        async def get(url):
+            nonlocal wire_bytes
+            async with session.get(url) as response:
+                wire_bytes += int(response.headers['Content-Length'])
+                encodings.add(response.headers.get('Content-Encoding', 'identity'))
+                return await response.text(encoding='utf-8', errors='ignore')
+        pages = await asyncio.gather(*(get(url) for url in urls))
+    return pages, wire_bytes, encodings
+
+
+async def fetch_negotiated(urls: list[str], encodings: tuple[str, ...]) -> tuple[list[str], SessionManager]:
+    """Fetch with SessionManager, which counts wire and decoded bytes itself."""
+    async with SessionManager(timeout=30, encodings=encodings) as session_manager:
+        pages = await asyncio.gather(*(session_manager.fetch(url) for url in urls))
+    return pages, session_manager
+
+
+async def negotiated_encoding(url: str, encodings: tuple[str, ...]) -> str:
+    """Return the Content-Encoding the server picks for SessionManager's Accept-Encoding."""
+    async with SessionManager(timeout=30, encodings=encodings) as session_manager:
+        async with session_manager.session.get(url) as response:
+            return response.headers.get('Content-Encoding', 'identity')
+
+
+def correct(page: str, charset: str) -> bool:
+    expected = EXPECTED if charset in ('utf-8', 'shift_jis') else EXPECTED_LATIN
+    return page is not None and expected in page
+
+
+async def bench(pages: int, paragraphs: int) -> None:
+    print(f"{'site':<18} {'client':<11} {'encoding':<9} {'wire_kb':>9} {'cpu_ms/page':>11} {'correct':>8}")
+    for name, args in SITES:
+        port = free_port()
+        server = subprocess.Popen(
+            [sys.executable, "-m", "benchmarks.site_server", "--pages", str(pages), "--port", str(port),
+             "--paragraphs", str(paragraphs)] + args,
+            stdout=subprocess.PIPE
+        )
+        server.stdout.readline()
+        charset = args[args.index('--charset') + 1] if '--charset' in args else 'utf-8'
+        urls = [f"http://127.0.0.1:{port}/page/{n}" for n in range(pages)]
+        try:
+            started = time.process_time()
+            legacy, wire_bytes, encodings = await fetch_legacy(urls)
+            cpu = (time.process_time() - started) * 1000 / pages
+            ok = sum(correct(page, charset) for page in legacy) / pages
+            print(f"{name:<18} {'legacy':<11} {','.join(sorted(encodings)):<9} {wire_bytes / 1024:>9.0f} "
+                  f"{cpu:>11.3f} {ok:>8.0%}")
+
+            for client, encodings in CLIENTS:
+                encoding = await negotiated_encoding(urls[0], encodings)
+                started = time.process_time()
+                negotiated, session_manager = await fetch_negotiated(urls, encodings)
+                cpu = (time.process_time() - started) * 1000 / pages
+                ok = sum(correct(page, charset) for page in negotiated) / pages
+                print(f"{name:<18} {client:<11} {encoding:<9} {session_manager.wire_bytes / 1024:>9.0f} "
+                      f"{cpu:>11.3f} {ok:>8.0%}")
+        finally:
+            server.terminate()
+            server.wait()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark compression negotiation and charset decoding.")
+    parser.add_argument("--pages", type=int, default=2000)
+    parser.add_argument("--paragraphs", type=int, default=20)
+    args = parser.parse_args()
+    asyncio.run(bench(args.pages, args.paragraphs))
+
+
+if __name__ == "__main__":
+    main()
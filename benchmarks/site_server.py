@@ -0,0 +1,173 @@
+import argparse
+import asyncio
+import gzip
+import zlib
+from aiohttp import web
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+PARAGRAPH = (
+    "Übersicht über die Größe der Café-Karte, naïve façade, ページの本文. "
+    "The quick brown fox jumps over the lazy dog while the crawler fetches every page. "
+)
+
+
+class SiteServer:
+    """Serves a deterministic synthetic website on localhost for benchmarks and tests."""
+
+    def __init__(
+        self,
+        pages: int = 1000,
+        links_per_page: int = 10,
+        latency: float = 0.0,
+        port: int = 0,
+        paragraphs: int = 0,
+        charset: str = 'utf-8',
+        meta_charset: bool = False,
+        compress: bool = False
+    ):
+        """
+        Initialize the synthetic site.
+
+        Args:
+            pages: Number of HTML pages, served at /page/0 .. /page/<pages - 1>
+            links_per_page: Number of outgoing links on each page
+            latency: Artificial delay before each response in seconds
+            port: Port to listen on (0 picks a free port)
+            paragraphs: Number of text paragraphs on each page
+            charset: Encoding of the pages
+            meta_charset: Declare the charset in a <meta> tag instead of the Content-Type header
+            compress: Compress responses with the best encoding the client accepts
+        """
+        self.pages = pages
+        self.links_per_page = links_per_page
+        self.latency = latency
+        self.port = port
+        self.paragraphs = paragraphs
+        self.charset = charset
+        self.meta_charset = meta_charset
+        self.compress = compress
+        self.requests = 0
+        self.wire_bytes = 0
+        self.runner: web.AppRunner = None
+
+    @property
+    def base_url(self) -> str:
+        """The URL of the first page."""
+        return f"http://127.0.0.1:{self.port}/page/0"
+
+    def page_urls(self) -> list[str]:
+        """Return the URLs of all pages."""
+        return [f"http://127.0.0.1:{self.port}/page/{n}" for n in range(self.pages)]
+
+    def render(self, n: int) -> str:
+        """Render page n with links spread deterministically over the site."""
+        links = "".join(
+            f'<li><a href="/page/{(n * 7 + k * 13 + 1) % self.pages}">Page</a></li>'
+            for k in range(self.links_per_page)
+        )
+        text = f"<p>{PARAGRAPH * 4}</p>" * self.paragraphs
+        meta = f'<meta charset="{self.charset}">' if self.meta_charset else ''
+        return f"<html><head>{meta}<title>Page {n}</title></head><body>{text}<ul>{links}</ul></body></html>"
+
+    @staticmethod
+    def negotiate(accept_encoding: str) -> str:
+        """Pick the supported encoding with the highest q-value, ties going to the client's order."""
+        available = {'gzip', 'deflate'} | ({'br'} if brotli else set()) | ({'zstd'} if zstandard else set())
+        best, best_q = 'identity', 0.0
+        for item in accept_encoding.split(','):
+            encoding, _, params = item.partition(';')
+            encoding = encoding.strip().lower()
+            q = 1.0
+            for param in params.split(';'):
+                name, _, value = param.partition('=')
+                if name.strip() == 'q':
+                    try:
+                        q = float(value)
+                    except ValueError:
+                        q = 0.0
+            if encoding in available and q > best_q:
+                best, best_q = encoding, q
+        return best
+
+    def encode(self, body: bytes, accept_encoding: str) -> tuple[bytes, str]:
+        """Compress a body with the encoding the client prefers."""
+        encoding = self.negotiate(accept_encoding)
+        if encoding == 'zstd':
+            return zstandard.ZstdCompressor().compress(body), encoding
+        if encoding == 'br':
+            return brotli.compress(body), encoding
+        if encoding == 'gzip':
+            return gzip.compress(body), encoding
+        if encoding == 'deflate':
+            return zlib.compress(body), encoding
+        return body, encoding
+
+    async def handle_page(self, request: web.Request) -> web.Response:
+        """Serve a synthetic page."""
+        self.requests += 1
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        n = int(request.match_info['n'])
+        if n >= self.pages:
+            raise web.HTTPNotFound()
+        body = self.render(n).encode(self.charset, errors='xmlcharrefreplace')
+        headers = {'Content-Type': 'text/html' if self.meta_charset else f'text/html; charset={self.charset}'}
+        if self.compress:
+            body, headers['Content-Encoding'] = self.encode(body, request.headers.get('Accept-Encoding', ''))
+        self.wire_bytes += len(body)
+        return web.Response(body=body, headers=headers)
+
+    def make_app(self) -> web.Application:
+        """Build the aiohttp application."""
+        app = web.Application()
+        app.router.add_get('/page/{n:\\d+}', self.handle_page)
+        return app
+
+    async def __aenter__(self):
+        """Start serving on 127.0.0.1."""
+        self.runner = web.AppRunner(self.make_app(), access_log=None)
+        await self.runner.setup()
+        site = web.TCPSite(self.runner, '127.0.0.1', self.port)
+        await site.start()
+        self.port = self.runner.addresses[0][1]
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        """Stop serving."""
+        await self.runner.cleanup()
+
+
+async def serve(server: SiteServer) -> None:
+    async with server:
+        print(f"Serving {server.pages} pages at {server.base_url}", flush=True)
+        await asyncio.Event().wait()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve a synthetic website on localhost.")
+    parser.add_argument("--pages", type=int, default=1000)
+    parser.add_argument("--links", type=int, default=10)
+    parser.add_argument("--latency", type=float, default=0.0)
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--paragraphs", type=int, default=0)
+    parser.add_argument("--charset", default='utf-8')
+    parser.add_argument("--meta-charset", action='store_true')
+    parser.add_argument("--compress", action='store_true')
+    args = parser.parse_args()
+    asyncio.run(serve(SiteServer(
+        args.pages, args.links, args.latency, args.port,
+        args.paragraphs, args.charset, args.meta_charset, args.compress
+    )))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,4 +1,5 @@
+from .content_decoder import ContentDecoder
 from .session_manager import SessionManager
 
-__all__ = ['SessionManager']
+__all__ = ['ContentDecoder', 'SessionManager']
 
@@ -0,0 +1,123 @@
+from typing import Optional, Sequence
+import codecs
+import re
+import zlib
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+
+class ContentDecoder:
+    """Negotiates transfer compression and decodes response bodies to text exactly once."""
+
+    # charset parameter of a Content-Type header
+    HEADER_CHARSET_PATTERN = re.compile(r'charset\s*=\s*["\']?([\w.:-]+)', re.IGNORECASE)
+    # <meta charset="..."> or <meta http-equiv="Content-Type" content="text/html; charset=...">
+    META_CHARSET_PATTERN = re.compile(rb'<meta[^>]+charset\s*=\s*["\']?([\w.:-]+)', re.IGNORECASE)
+    # Browsers only look for a <meta> charset in the first 1024 bytes
+    META_SNIFF_BYTES = 1024
+    DEFAULT_CHARSET = 'utf-8'
+    # Brotli sends the fewest bytes for HTML, zstd decompresses with about half the CPU
+    ENCODINGS = ('br', 'zstd', 'gzip', 'deflate')
+
+    def __init__(self, encodings: Sequence[str] = ENCODINGS):
+        """
+        Initialize the decoder.
+
+        Args:
+            encodings: Content-Encodings to negotiate, most preferred first. Encodings whose
+                library is not installed are left out.
+        """
+        available = {'br': brotli is not None, 'zstd': zstandard is not None, 'gzip': True, 'deflate': True}
+        unknown = set(encodings) - available.keys()
+        if unknown:
+            raise ValueError(f"Unsupported encodings: {', '.join(sorted(unknown))}")
+        self.encodings = tuple(encoding for encoding in encodings if available[encoding])
+
+    @property
+    def accept_encoding(self) -> str:
+        """Value of the Accept-Encoding request header, with q-values falling in order of preference."""
+        return ', '.join(f"{encoding};q={1.0 - 0.1 * rank:.1f}" for rank, encoding in enumerate(self.encodings))
+
+    def decompress(self, body: bytes, content_encoding: str) -> Optional[bytes]:
+        """
+        Undo the Content-Encoding of a response body.
+
+        Stacked encodings such as 'gzip, br' are undone in reverse order of application.
+
+        Args:
+            body: The body as received on the wire
+            content_encoding: The Content-Encoding header of the response
+
+        Returns:
+            The decompressed body, or None if an encoding is not supported or the body is corrupt
+        """
+        for encoding in reversed(content_encoding.split(',')):
+            body = self._decompress_one(body, encoding.strip().lower())
+            if body is None:
+                return None
+        return body
+
+    def _decompress_one(self, body: bytes, encoding: str) -> Optional[bytes]:
+        """Undo a single content coding, returning None if it is not supported or the body is corrupt."""
+        try:
+            if encoding in ('', 'identity'):
+                return body
+            if encoding in ('gzip', 'x-gzip'):
+                return zlib.decompress(body, 16 + zlib.MAX_WBITS)
+            if encoding == 'deflate':
+                # Servers send both zlib-wrapped and raw deflate streams
+                try:
+                    return zlib.decompress(body)
+                except zlib.error:
+                    return zlib.decompress(body, -zlib.MAX_WBITS)
+            if encoding == 'br' and brotli:
+                return brotli.decompress(body)
+            if encoding == 'zstd' and zstandard:
+                return zstandard.ZstdDecompressor().decompressobj().decompress(body)
+        except Exception:
+            return None
+        return None
+
+    def detect_charset(self, content_type: str, body: bytes) -> str:
+        """
+        Detect the charset of an HTML body from the Content-Type header or a <meta> tag.
+
+        Args:
+            content_type: The Content-Type header of the response
+            body: The decompressed body
+
+        Returns:
+            A codec name known to Python, utf-8 if none is declared or the declared one is unknown
+        """
+        match = self.HEADER_CHARSET_PATTERN.search(content_type)
+        charset = match.group(1) if match else None
+        if not charset:
+            match = self.META_CHARSET_PATTERN.search(body, 0, self.META_SNIFF_BYTES)
+            charset = match.group(1).decode('ascii') if match else None
+        if charset:
+            try:
+                return codecs.lookup(charset).name
+            except LookupError:
+                pass
+        return self.DEFAULT_CHARSET
+
+    def decode(self, body: bytes, content_type: str) -> str:
+        """
+        Decode a decompressed body to text using its detected charset.
+
+        Args:
+            body: The decompressed body
+            content_type: The Content-Type header of the response
+
+        Returns:
+            The body as a string, with undecodable bytes replaced
+        """
+        return body.decode(self.detect_charset(content_type, body), errors='replace')
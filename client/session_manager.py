@@ -1,33 +1,69 @@
-from aiohttp import ClientSession, TCPConnector
-from typing import Optional
+from aiohttp import ClientSession, ClientTimeout, TCPConnector
+from typing import Callable, Optional, Sequence
+from .content_decoder import ContentDecoder
 
 
 class SessionManager:
     """Manages aiohttp ClientSession for making HTTP requests with connection pooling."""
 
-    def __init__(self, timeout: int = 10, max_connections: int = 100):
+    def __init__(
+        self,
+        timeout: Optional[float] = 10,
+        max_connections: int = 100,
+        on_content_type: Optional[Callable[[str, str], None]] = None,
+        limit_per_host: int = 30,
+        dns_ttl: int = 300,
+        keepalive_timeout: Optional[float] = None,
+        connect_timeout: Optional[float] = None,
+        read_timeout: Optional[float] = None,
+        encodings: Sequence[str] = ContentDecoder.ENCODINGS
+    ):
         """
         Initialize the SessionManager with connection pooling.
 
         Args:
-            timeout: Default timeout for requests in seconds
+            timeout: Total timeout for a request in seconds, None for no total timeout
             max_connections: Maximum number of concurrent connections
+            on_content_type: Optional callback receiving (url, content_type) for every 200 response
+            limit_per_host: Maximum number of concurrent connections per host
+            dns_ttl: DNS cache TTL in seconds
+            keepalive_timeout: Seconds an idle connection is kept open (aiohttp default if None)
+            connect_timeout: Timeout for establishing a new connection, in seconds
+            read_timeout: Timeout between two reads of the response body, in seconds
+            encodings: Content-Encodings to negotiate, most preferred first
         """
-        self.timeout = timeout
+        self.timeout = ClientTimeout(total=timeout, sock_connect=connect_timeout, sock_read=read_timeout)
         self.max_connections = max_connections
+        self.on_content_type = on_content_type
+        self.limit_per_host = limit_per_host
+        self.dns_ttl = dns_ttl
+        self.keepalive_timeout = keepalive_timeout
+        self.decoder = ContentDecoder(encodings)
+        # Bytes received on the wire and after decompression, for HTML responses
+        self.wire_bytes = 0
+        self.decoded_bytes = 0
         self.session: Optional[ClientSession] = None
 
     async def __aenter__(self):
         """Enter async context manager with connection pooling."""
         # TCPConnector with connection pooling
+        connector_options = {}
+        if self.keepalive_timeout is not None:
+            connector_options['keepalive_timeout'] = self.keepalive_timeout
         connector = TCPConnector(
             limit=self.max_connections,  # Max total connections
-            limit_per_host=30,  # Max connections per host
-            ttl_dns_cache=300,  # DNS cache for 5 minutes
+            limit_per_host=self.limit_per_host,  # Max connections per host
+            ttl_dns_cache=self.dns_ttl,  # DNS cache TTL
             force_close=False,  # Reuse connections
-            enable_cleanup_closed=True  # Clean up closed connections
+            enable_cleanup_closed=True,  # Clean up closed connections
+            **connector_options
+        )
+        # Bodies are decompressed by ContentDecoder so wire and decoded sizes can be accounted
+        self.session = ClientSession(
+            connector=connector,
+            auto_decompress=False,
+            headers={'Accept-Encoding': self.decoder.accept_encoding}
         )
-        self.session = ClientSession(connector=connector)
         return self
 
     async def __aexit__(self, exc_type, exc_val, exc_tb):
@@ -35,10 +71,18 @@ class SessionManager:
         if self.session:
             await self.session.close()
 
+    @property
+    def compression_ratio(self) -> float:
+        """Decoded bytes per byte received on the wire."""
+        return self.decoded_bytes / self.wire_bytes if self.wire_bytes else 1.0
+
     async def fetch(self, url: str) -> Optional[str]:
         """
         Fetch the content of a URL asynchronously with early content-type checking.
 
+        The body is decompressed according to its Content-Encoding and decoded with the
+        charset declared in the Content-Type header or a <meta> tag (utf-8 otherwise).
+
         Args:
             url: The URL to fetch
 
@@ -56,13 +100,20 @@ class SessionManager:
 
                 # Early content-type check (before downloading)
                 content_type = response.headers.get('Content-Type', '')
+                if self.on_content_type:
+                    self.on_content_type(url, content_type)
                 if 'text/html' not in content_type:
                     return None
 
-                # Download the full response with efficient encoding
-                content = await response.text(encoding='utf-8', errors='ignore')
+                # Download the raw body, then decompress and decode it once
+                body = await response.read()
+                decompressed = self.decoder.decompress(body, response.headers.get('Content-Encoding', ''))
+                if decompressed is None:
+                    return None
+                self.wire_bytes += len(body)
+                self.decoded_bytes += len(decompressed)
 
-                return content
+                return self.decoder.decode(decompressed, content_type)
         except Exception:
             pass
         return None
@@ -0,0 +1,4 @@
+from .coordinator import Coordinator
+from .remote_queue_manager import RemoteQueueManager
+
+__all__ = ['Coordinator', 'RemoteQueueManager']
@@ -0,0 +1,167 @@
+import argparse
+import asyncio
+import itertools
+import time
+from collections import deque
+from typing import Callable, Optional
+from .protocol import read_frame, write_frame
+
+
+class Coordinator:
+    """Shares one frontier and seen set between crawler nodes, handing out URLs in expiring leases."""
+
+    def __init__(self, lease_ttl: float = 30.0, clock: Callable[[], float] = time.monotonic):
+        """
+        Initialize the coordinator.
+
+        Args:
+            lease_ttl: Seconds after which unreported URLs of a lease are redelivered
+            clock: Function returning the current time in seconds
+        """
+        self.lease_ttl = lease_ttl
+        self.clock = clock
+        self.frontier: deque[str] = deque()
+        # Every URL ever queued, so each is handed out once unless its lease expires
+        self.seen: set[str] = set()
+        # Lease id -> [URLs not yet reported done, deadline]
+        self.leases: dict[int, list] = {}
+        self.lease_ids = itertools.count(1)
+        self.completed = 0
+        self.redelivered = 0
+        self.server: Optional[asyncio.AbstractServer] = None
+        self.nodes: set[asyncio.StreamWriter] = set()
+        self.port: Optional[int] = None
+
+    @property
+    def finished(self) -> bool:
+        """True once the frontier is empty and every lease has been reported."""
+        return not self.frontier and not self.leases
+
+    def add(self, urls: list[str]) -> None:
+        """
+        Queue URLs that have not been seen before.
+
+        Args:
+            urls: The URLs to queue
+        """
+        for url in urls:
+            if url not in self.seen:
+                self.seen.add(url)
+                self.frontier.append(url)
+
+    def expire(self) -> None:
+        """Requeue the unreported URLs of expired leases at the front of the frontier."""
+        now = self.clock()
+        for lease_id, (remaining, deadline) in list(self.leases.items()):
+            if deadline <= now:
+                del self.leases[lease_id]
+                self.frontier.extendleft(remaining)
+                self.redelivered += len(remaining)
+
+    def handle(self, request: dict) -> dict:
+        """
+        Apply a sync request from a node and lease it new URLs.
+
+        Args:
+            request: {'done': {lease id: [URLs]}, 'links': [URLs], 'lease': number of URLs wanted}
+
+        Returns:
+            {'lease': lease id or None, 'urls': [URLs], 'finished': bool}
+        """
+        for lease_id, urls in request.get('done', {}).items():
+            lease = self.leases.get(int(lease_id))
+            # Reports for expired leases are ignored, their URLs were redelivered
+            if lease is None:
+                continue
+            lease[0].difference_update(urls)
+            self.completed += len(urls)
+            if not lease[0]:
+                del self.leases[int(lease_id)]
+
+        self.add(request.get('links', []))
+        self.expire()
+
+        count = min(request.get('lease', 0), len(self.frontier))
+        if not count:
+            return {'lease': None, 'urls': [], 'finished': self.finished}
+
+        urls = [self.frontier.popleft() for _ in range(count)]
+        lease_id = next(self.lease_ids)
+        self.leases[lease_id] = [set(urls), self.clock() + self.lease_ttl]
+        return {'lease': lease_id, 'urls': urls, 'finished': False}
+
+    async def start(self, host: str = '127.0.0.1', port: int = 0) -> None:
+        """
+        Start accepting nodes.
+
+        Args:
+            host: Address to listen on
+            port: Port to listen on (0 picks a free port)
+        """
+        self.server = await asyncio.start_server(self._serve_node, host, port)
+        self.port = self.server.sockets[0].getsockname()[1]
+
+    async def stop(self) -> None:
+        """Stop accepting nodes, close the listening socket and disconnect the connected nodes."""
+        if self.server:
+            self.server.close()
+            for writer in self.nodes:
+                writer.close()
+            await self.server.wait_closed()
+            self.server = None
+
+    async def _serve_node(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """Answer the sync requests of one node until it disconnects."""
+        self.nodes.add(writer)
+        try:
+            while True:
+                request = await read_frame(reader)
+                if request is None:
+                    break
+                await write_frame(writer, self.handle(request))
+        except (ConnectionError, ValueError):
+            pass
+        finally:
+            self.nodes.discard(writer)
+            writer.close()
+
+
+async def serve(base_url: str, host: str, port: int, lease_ttl: float, linger: float) -> None:
+    """
+    Coordinate a crawl from a base URL until every node finished it.
+
+    Args:
+        base_url: The URL to start crawling from
+        host: Address to listen on
+        port: Port to listen on
+        lease_ttl: Seconds after which unreported URLs of a lease are redelivered
+        linger: Seconds to keep serving after the crawl finished, so nodes can observe it
+    """
+    coordinator = Coordinator(lease_ttl=lease_ttl)
+    coordinator.add([base_url])
+    await coordinator.start(host, port)
+    print(f"Coordinating {base_url} on {host}:{coordinator.port}", flush=True)
+
+    while not coordinator.finished:
+        await asyncio.sleep(0.5)
+    # Leave time for the nodes to observe that the crawl finished
+    await asyncio.sleep(linger)
+    await coordinator.stop()
+    print(f"Finished: {coordinator.completed} URLs, {coordinator.redelivered} redelivered", flush=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Coordinate a crawl shared by several crawler nodes.")
+    parser.add_argument("url", help="The URL to start crawling from")
+    parser.add_argument("--host", default='127.0.0.1')
+    parser.add_argument("--port", type=int, default=9000)
+    parser.add_argument("--lease-ttl", type=float, default=30.0,
+                        help="Seconds after which unreported URLs are redelivered (default: 30)")
+    parser.add_argument("--linger", type=float, default=2.0,
+                        help="Seconds to keep serving after the crawl finished (default: 2)")
+    args = parser.parse_args()
+    asyncio.run(serve(args.url, args.host, args.port, args.lease_ttl, args.linger))
+
+
+if __name__ == "__main__":
+    main()
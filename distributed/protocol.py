@@ -0,0 +1,44 @@
+from typing import Optional
+import asyncio
+import json
+import struct
+
+# Frames are a 4-byte big-endian payload length followed by a UTF-8 JSON object
+HEADER = struct.Struct('>I')
+MAX_FRAME_BYTES = 64 * 1024 * 1024
+
+
+async def read_frame(reader: asyncio.StreamReader) -> Optional[dict]:
+    """
+    Read one frame from a stream.
+
+    Args:
+        reader: The stream to read from
+
+    Returns:
+        The decoded message, or None if the peer closed the connection
+
+    Raises:
+        ValueError: If the frame exceeds MAX_FRAME_BYTES
+    """
+    try:
+        header = await reader.readexactly(HEADER.size)
+    except asyncio.IncompleteReadError:
+        return None
+    (length,) = HEADER.unpack(header)
+    if length > MAX_FRAME_BYTES:
+        raise ValueError(f"Frame of {length} bytes exceeds the {MAX_FRAME_BYTES} byte limit")
+    return json.loads(await reader.readexactly(length))
+
+
+async def write_frame(writer: asyncio.StreamWriter, message: dict) -> None:
+    """
+    Write one frame to a stream.
+
+    Args:
+        writer: The stream to write to
+        message: The message to encode as JSON
+    """
+    payload = json.dumps(message, separators=(',', ':')).encode()
+    writer.write(HEADER.pack(len(payload)) + payload)
+    await writer.drain()
@@ -0,0 +1,161 @@
+import asyncio
+from typing import Optional
+from helper.queue_manager import QueueManager
+from .protocol import read_frame, write_frame
+
+
+class RemoteQueueManager(QueueManager):
+    """QueueManager backed by a Coordinator, leasing URL batches and reporting links in bulk."""
+
+    def __init__(
+        self,
+        host: str,
+        port: int,
+        batch_size: int = 50,
+        poll_interval: float = 0.1,
+        retries: int = 3,
+        retry_delay: float = 1.0
+    ):
+        """
+        Initialize the remote queue manager.
+
+        Args:
+            host: Coordinator address
+            port: Coordinator port
+            batch_size: Number of URLs leased at once, and of links buffered before they are reported
+            poll_interval: Seconds to wait before asking again when the coordinator has no URLs
+            retries: Number of reconnects attempted before the coordinator is considered gone
+            retry_delay: Seconds to wait before each reconnect
+        """
+        super().__init__()
+        self.host = host
+        self.port = port
+        self.batch_size = batch_size
+        self.poll_interval = poll_interval
+        self.retries = retries
+        self.retry_delay = retry_delay
+        self.rpc_lock: asyncio.Lock = asyncio.Lock()
+        self.lease_lock: asyncio.Lock = asyncio.Lock()
+        self.finished: asyncio.Event = asyncio.Event()
+        # Leased URL -> lease id, until the URL is marked done
+        self.leased: dict[str, int] = {}
+        self.pending_done: dict[int, list[str]] = {}
+        self.pending_links: list[str] = []
+        # Set once the coordinator is unreachable; raised by join() and every later sync
+        self.error: Optional[ConnectionError] = None
+        self._reader: Optional[asyncio.StreamReader] = None
+        self._writer: Optional[asyncio.StreamWriter] = None
+
+    async def add(self, item: str) -> None:
+        """
+        Buffer a link for the coordinator, reporting the buffer once it holds a full batch.
+
+        Args:
+            item: The link to add
+        """
+        self.pending_links.append(item)
+        if len(self.pending_links) >= self.batch_size:
+            await self.sync(lease=0)
+
+    async def get_next(self) -> str:
+        """
+        Get the next leased URL, leasing a new batch from the coordinator when none are left.
+
+        Returns:
+            The next URL; blocks forever once the crawl finished or the coordinator is gone
+        """
+        while self.queue.empty() and not self.finished.is_set():
+            async with self.lease_lock:
+                if not self.queue.empty() or self.finished.is_set():
+                    break
+                try:
+                    leased = await self.sync(lease=self.batch_size)
+                except ConnectionError:
+                    # Recorded in self.error and raised by join()
+                    break
+                if not leased:
+                    await asyncio.sleep(self.poll_interval)
+        return await self.queue.get()
+
+    def task_done(self, item: Optional[str] = None) -> None:
+        """
+        Mark a leased URL as done; it is reported with the next sync.
+
+        Args:
+            item: The processed URL
+        """
+        self.queue.task_done()
+        lease_id = self.leased.pop(item, None)
+        if lease_id is not None:
+            self.pending_done.setdefault(lease_id, []).append(item)
+
+    async def join(self) -> None:
+        """
+        Wait until the coordinator reports that every node finished the crawl.
+
+        Raises:
+            ConnectionError: If the coordinator could not be reached after `retries` reconnects
+        """
+        await self.finished.wait()
+        if self.error:
+            raise self.error
+
+    def close(self) -> None:
+        """Close the connection to the coordinator."""
+        if self._writer:
+            self._writer.close()
+            self._writer = None
+
+    async def sync(self, lease: int) -> int:
+        """
+        Report done URLs and buffered links, and lease new URLs.
+
+        Args:
+            lease: Number of URLs to lease (0 only reports)
+
+        Returns:
+            The number of URLs leased
+
+        Raises:
+            ConnectionError: If the coordinator could not be reached, or answered with invalid
+                frames, after `retries` reconnects
+        """
+        async with self.rpc_lock:
+            if self.error:
+                raise self.error
+
+            done, self.pending_done = self.pending_done, {}
+            links, self.pending_links = self.pending_links, []
+            request = {'done': done, 'links': links, 'lease': lease}
+            for attempt in range(self.retries + 1):
+                try:
+                    response = await self._request(request)
+                    break
+                except (OSError, EOFError, ValueError) as e:
+                    # Connection failures and corrupt or oversized frames alike
+                    self.close()
+                    if attempt == self.retries:
+                        self.error = ConnectionError(f"Lost the coordinator at {self.host}:{self.port}: {e}")
+                        # Wake join() so the crawl stops instead of waiting forever
+                        self.finished.set()
+                        raise self.error from e
+                    await asyncio.sleep(self.retry_delay)
+
+        for url in response['urls']:
+            self.leased[url] = response['lease']
+            self.queue.put_nowait(url)
+        if response['finished']:
+            self.finished.set()
+        return len(response['urls'])
+
+    async def _request(self, request: dict) -> dict:
+        """Send one request to the coordinator, connecting first if needed, and read its response."""
+        if self._writer is None:
+            self._reader, self._writer = await asyncio.open_connection(self.host, self.port)
+        await write_frame(self._writer, request)
+        response = await read_frame(self._reader)
+        if response is None:
+            raise ConnectionError("Coordinator closed the connection")
+        if not isinstance(response, dict) or not {'lease', 'urls', 'finished'} <= response.keys():
+            raise ValueError("Malformed coordinator response")
+        return response
@@ -1,7 +1,11 @@
 from .extractor import Extractor, LinksExtractor
 from .filter import LinksFilter, LinksDomainFilter
+from .classifier import LinksResourceClassifier
 from .printer import Printer, LinksPrinter
-from .queue_manager import QueueManager
+from .queue_manager import QueueManager, SpillingQueueManager
+from .memo import ExtractionMemo
+from .recrawl import RecrawlScheduler
+from .profiler import Profiler, NullProfiler, CrawlProfiler
 
-__all__ = ['Extractor', 'LinksExtractor', 'LinksFilter', 'LinksDomainFilter', 'Printer', 'LinksPrinter', 'QueueManager']
+__all__ = ['Extractor', 'LinksExtractor', 'LinksFilter', 'LinksDomainFilter', 'LinksResourceClassifier', 'Printer', 'LinksPrinter', 'QueueManager', 'SpillingQueueManager', 'RecrawlScheduler', 'ExtractionMemo', 'Profiler', 'NullProfiler', 'CrawlProfiler']
 
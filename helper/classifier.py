@@ -0,0 +1,104 @@
+from posixpath import splitext
+from yarl import URL
+from .filter import LinksFilter
+
+
+class LinksResourceClassifier(LinksFilter):
+    """Drops links that are likely non-HTML resources before they are fetched."""
+
+    # Extensions that never serve crawlable HTML
+    NON_HTML_EXTENSIONS = frozenset({
+        # Documents
+        '.pdf', '.doc', '.docx', '.xls', '.xlsx', '.ppt', '.pptx', '.odt', '.csv', '.txt', '.xml', '.json',
+        # Images
+        '.jpg', '.jpeg', '.png', '.gif', '.webp', '.svg', '.ico', '.bmp', '.tif', '.tiff', '.avif',
+        # Archives
+        '.zip', '.gz', '.tgz', '.tar', '.rar', '.7z', '.bz2', '.xz',
+        # Audio and video
+        '.mp3', '.mp4', '.wav', '.ogg', '.avi', '.mov', '.mkv', '.webm', '.flv', '.m4a', '.m4v',
+        # Static assets and binaries
+        '.css', '.js', '.woff', '.woff2', '.ttf', '.eot', '.exe', '.dmg', '.apk', '.iso', '.bin',
+    })
+
+    def __init__(self, threshold: float = 0.9):
+        """
+        Initialize the classifier.
+
+        Args:
+            threshold: Minimum estimated probability that a URL template serves
+                non-HTML content before its links are dropped (0.0 - 1.0)
+        """
+        if not 0.0 < threshold <= 1.0:
+            raise ValueError("threshold must be in the range (0.0, 1.0]")
+        self.threshold = threshold
+        # URL template -> [html responses, non-html responses]
+        self.history: dict[str, list[int]] = {}
+        self.skipped_by_extension = 0
+        self.skipped_by_history = 0
+        # URLs already counted, so a link found on many pages is counted once
+        self._skipped_urls: set[str] = set()
+
+    @property
+    def skipped(self) -> int:
+        """Total number of unique URLs dropped by the classifier."""
+        return self.skipped_by_extension + self.skipped_by_history
+
+    @staticmethod
+    def template(url: URL) -> str:
+        """
+        Build the template a URL belongs to by replacing its last path segment.
+
+        Args:
+            url: The parsed URL
+
+        Returns:
+            The URL template, e.g. 'example.com/media/*' for 'https://example.com/media/a.jpg'
+        """
+        directory = url.path.rsplit('/', 1)[0]
+        return f"{url.host}{directory}/*"
+
+    def observe(self, url: str, content_type: str) -> None:
+        """
+        Record the Content-Type a URL was served with.
+
+        Args:
+            url: The fetched URL
+            content_type: The Content-Type header of the response
+        """
+        counts = self.history.setdefault(self.template(URL(url)), [0, 0])
+        counts['text/html' not in content_type] += 1
+
+    def probability(self, url: str) -> float:
+        """
+        Estimate the probability that a URL serves non-HTML content.
+
+        Args:
+            url: The URL to classify
+
+        Returns:
+            1.0 for known non-HTML extensions, otherwise the smoothed share of
+            non-HTML responses observed for the URL's template
+        """
+        parsed = URL(url)
+        if splitext(parsed.path)[1].lower() in self.NON_HTML_EXTENSIONS:
+            return 1.0
+        html, non_html = self.history.get(self.template(parsed), (0, 0))
+        # One implicit HTML observation keeps unseen templates from being dropped
+        return non_html / (html + non_html + 1)
+
+    def filter(self, links: set[str]) -> set[str]:
+        """Filter out links whose non-HTML probability reaches the threshold."""
+        kept = set()
+        for link in links:
+            probability = self.probability(link)
+            if probability < self.threshold:
+                kept.add(link)
+            elif link in self._skipped_urls:
+                continue
+            elif probability == 1.0:
+                self._skipped_urls.add(link)
+                self.skipped_by_extension += 1
+            else:
+                self._skipped_urls.add(link)
+                self.skipped_by_history += 1
+        return kept
@@ -0,0 +1,91 @@
+from collections import OrderedDict
+from typing import Optional
+import hashlib
+import sys
+
+
+class ExtractionMemo:
+    """Bounded LRU cache of filtered links keyed by page content hash and base-URL directory."""
+
+    def __init__(self, max_bytes: int = 16 * 1024 * 1024):
+        """
+        Initialize the memo.
+
+        Args:
+            max_bytes: Approximate memory cap for the cached link sets in bytes
+        """
+        self.max_bytes = max_bytes
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.entries: OrderedDict[tuple[bytes, str], tuple[frozenset[str], int]] = OrderedDict()
+
+    @property
+    def hit_rate(self) -> float:
+        """Share of lookups answered from the memo."""
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    @staticmethod
+    def key(url: str, content: str) -> tuple[bytes, str]:
+        """
+        Build the memo key of a page.
+
+        Relative links resolve against the directory of the URL, so pages with the
+        same content in the same directory extract to the same links.
+
+        Args:
+            url: The page URL
+            content: The page content
+
+        Returns:
+            The content digest and the URL up to its last '/'
+        """
+        digest = hashlib.blake2b(content.encode(), digest_size=16).digest()
+        directory = url.split('?', 1)[0].rsplit('/', 1)[0]
+        return digest, directory
+
+    def get(self, key: tuple[bytes, str]) -> Optional[frozenset[str]]:
+        """
+        Look up the links of a page.
+
+        Args:
+            key: The memo key of the page
+
+        Returns:
+            The cached links, or None on a miss
+        """
+        entry = self.entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        self.entries.move_to_end(key)
+        self.hits += 1
+        return entry[0]
+
+    def put(self, key: tuple[bytes, str], url: str, links: set[str]) -> None:
+        """
+        Store the links of a page, evicting the least recently used entries over the cap.
+
+        Pages with links to themselves or query-only links ('?', '?page=2') are not stored,
+        since those resolve against the file name rather than the directory.
+
+        Args:
+            key: The memo key of the page
+            url: The page URL
+            links: The filtered links of the page
+        """
+        page = url.split('?', 1)[0]
+        if any(link == page or link.startswith(page + '?') for link in links):
+            return
+
+        links = frozenset(links)
+        size = sys.getsizeof(links) + sum(sys.getsizeof(link) for link in links) + sys.getsizeof(key[1])
+        if size > self.max_bytes or key in self.entries:
+            return
+
+        self.entries[key] = (links, size)
+        self.bytes += size
+        while self.bytes > self.max_bytes:
+            _, (_, evicted) = self.entries.popitem(last=False)
+            self.bytes -= evicted
@@ -0,0 +1,193 @@
+from abc import ABC, abstractmethod
+from contextlib import contextmanager, nullcontext
+from pathlib import Path
+from typing import ContextManager, Iterator, Optional
+import asyncio
+import cProfile
+import time
+import tracemalloc
+
+
+class Profiler(ABC):
+    """Interface for profiling a crawl."""
+
+    @abstractmethod
+    def start(self) -> None:
+        """Start profiling."""
+        pass
+
+    @abstractmethod
+    async def stop(self) -> None:
+        """Stop profiling and flush the collected data."""
+        pass
+
+    @abstractmethod
+    def stage(self, name: str) -> ContextManager:
+        """Return a context manager that attributes the enclosed work to a stage."""
+        pass
+
+    @abstractmethod
+    def page_done(self) -> None:
+        """Record that a page has been processed."""
+        pass
+
+
+class NullProfiler(Profiler):
+    """Profiler that does nothing, used when profiling is disabled."""
+
+    _NULL_CONTEXT = nullcontext()
+
+    def start(self) -> None:
+        pass
+
+    async def stop(self) -> None:
+        pass
+
+    def stage(self, name: str) -> ContextManager:
+        return self._NULL_CONTEXT
+
+    def page_done(self) -> None:
+        pass
+
+
+class CrawlProfiler(Profiler):
+    """Periodically dumps cProfile stats and tracemalloc top allocators, and monitors event-loop lag."""
+
+    def __init__(
+        self,
+        output_dir: str,
+        every_pages: int = 500,
+        every_seconds: float = 30.0,
+        lag_interval: float = 0.05,
+        lag_threshold: float = 0.1,
+        top_allocators: int = 25
+    ):
+        """
+        Initialize the profiler.
+
+        Args:
+            output_dir: Directory the snapshots are written to
+            every_pages: Take a snapshot after this many processed pages
+            every_seconds: Take a snapshot after this many seconds
+            lag_interval: How often the loop-lag probe wakes up in seconds
+            lag_threshold: Minimum lag in seconds recorded as a blocked loop
+            top_allocators: Number of allocation sites written per tracemalloc snapshot
+        """
+        if every_pages < 1:
+            raise ValueError("every_pages must be at least 1")
+        if every_seconds <= 0:
+            raise ValueError("every_seconds must be positive")
+        self.output_dir = Path(output_dir)
+        self.every_pages = every_pages
+        self.every_seconds = every_seconds
+        self.lag_interval = lag_interval
+        self.lag_threshold = lag_threshold
+        self.top_allocators = top_allocators
+
+        self.pages = 0
+        self.snapshots = 0
+        # Stage name -> [number of blocks, total blocked seconds, worst block]
+        self.blocks: dict[str, list[float]] = {}
+        self._stage_time: dict[str, float] = {}
+        self._profile: Optional[cProfile.Profile] = None
+        self._probe: Optional[asyncio.Task] = None
+        self._last_snapshot = 0.0
+        self._snapshot_due = False
+
+    def start(self) -> None:
+        """Start cProfile, tracemalloc and the loop-lag probe."""
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        tracemalloc.start()
+        self._profile = cProfile.Profile()
+        self._profile.enable()
+        self._last_snapshot = time.monotonic()
+        self._probe = asyncio.create_task(self._probe_loop())
+
+    async def stop(self) -> None:
+        """Stop the probe, write a final snapshot and the loop-lag report."""
+        if self._probe:
+            self._probe.cancel()
+            try:
+                await self._probe
+            except asyncio.CancelledError:
+                pass
+            self._probe = None
+        await self.snapshot()
+        if self._profile:
+            self._profile.disable()
+            self._profile = None
+        tracemalloc.stop()
+        await asyncio.to_thread(self._write_lag_report)
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        """
+        Attribute the enclosed synchronous work to a stage.
+
+        Args:
+            name: The stage name, e.g. 'extract', 'filter' or 'print'
+        """
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self._stage_time[name] = self._stage_time.get(name, 0.0) + time.perf_counter() - started
+
+    def page_done(self) -> None:
+        """Count a processed page and request a snapshot every `every_pages` pages."""
+        self.pages += 1
+        if self.pages % self.every_pages == 0:
+            # Taken by the probe, so the snapshot does not run inside a stage
+            self._snapshot_due = True
+
+    async def snapshot(self) -> None:
+        """Write the cProfile stats and tracemalloc top allocators collected since the last snapshot."""
+        self.snapshots += 1
+        self._snapshot_due = False
+        self._last_snapshot = time.monotonic()
+        number = self.snapshots
+
+        if self._profile:
+            # Profiles are bound to the loop thread, only the dump runs in a worker thread
+            profile = self._profile
+            profile.disable()
+            self._profile = cProfile.Profile()
+            self._profile.enable()
+            await asyncio.to_thread(profile.dump_stats, self.output_dir / f"profile-{number:04d}.prof")
+
+        if tracemalloc.is_tracing():
+            await asyncio.to_thread(self._write_allocators, number, self.pages)
+
+    def _write_allocators(self, number: int, pages: int) -> None:
+        """Write the top tracemalloc allocation sites."""
+        stats = tracemalloc.take_snapshot().statistics('lineno')[:self.top_allocators]
+        lines = [f"pages={pages}"] + [str(stat) for stat in stats]
+        (self.output_dir / f"alloc-{number:04d}.txt").write_text("\n".join(lines) + "\n")
+
+    async def _probe_loop(self) -> None:
+        """Measure how late the loop wakes the probe and attribute long blocks to the busiest stage."""
+        loop = asyncio.get_running_loop()
+        while True:
+            expected = loop.time() + self.lag_interval
+            await asyncio.sleep(self.lag_interval)
+            lag = loop.time() - expected
+
+            if lag >= self.lag_threshold:
+                stage = max(self._stage_time, key=self._stage_time.get) if self._stage_time else 'other'
+                block = self.blocks.setdefault(stage, [0, 0.0, 0.0])
+                block[0] += 1
+                block[1] += lag
+                block[2] = max(block[2], lag)
+            self._stage_time.clear()
+
+            if self._snapshot_due or time.monotonic() - self._last_snapshot >= self.every_seconds:
+                # The next lag measurement starts after the snapshot, so it is not counted as lag
+                await self.snapshot()
+                self._stage_time.clear()
+
+    def _write_lag_report(self) -> None:
+        """Write the loop-lag blocks per stage."""
+        lines = [f"{'stage':<10} {'blocks':>8} {'total_s':>10} {'worst_s':>10}"]
+        for stage, (count, total, worst) in sorted(self.blocks.items(), key=lambda item: -item[1][1]):
+            lines.append(f"{stage:<10} {count:>8} {total:>10.3f} {worst:>10.3f}")
+        (self.output_dir / "loop-lag.txt").write_text("\n".join(lines) + "\n")
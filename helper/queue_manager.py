@@ -1,4 +1,8 @@
 import asyncio
+import shutil
+import tempfile
+from collections import deque
+from pathlib import Path
 from typing import Optional
 
 
@@ -28,8 +32,13 @@ class QueueManager:
         """
         return await self.queue.get()
     
-    def task_done(self) -> None:
-        """Mark a task as done."""
+    def task_done(self, item: Optional[str] = None) -> None:
+        """
+        Mark a task as done.
+
+        Args:
+            item: The processed item, for backends that track items individually
+        """
         self.queue.task_done()
     
     def is_incomplete(self) -> bool:
@@ -50,10 +59,23 @@ class QueueManager:
         """
         return self.queue.empty()
     
+    def size(self) -> int:
+        """
+        Get the number of items waiting in the queue.
+
+        Returns:
+            The number of queued items
+        """
+        return self.queue.qsize()
+
     async def join(self) -> None:
         """Wait until all tasks in the queue are processed."""
         await self.queue.join()
 
+    def close(self) -> None:
+        """Release resources held by the queue."""
+        pass
+
     async def add_unvisited(self, links: set[str], visited: set[str]) -> None:
         """
         Add unvisited links to the queue.
@@ -85,5 +107,143 @@ class QueueManager:
                 if url not in visited:
                     visited.add(url)
                     return url
-            self.task_done()
+            self.task_done(url)
+
+
+class SpillingQueueManager(QueueManager):
+    """QueueManager that keeps at most `memory_limit` items in memory and spills the rest to disk."""
+
+    def __init__(self, memory_limit: int = 100_000, batch_size: int = 1000, spill_dir: Optional[str] = None):
+        """
+        Initialize the spilling queue manager.
+
+        Args:
+            memory_limit: Maximum number of items held in the in-memory queue
+            batch_size: Number of items written to or read from one segment file
+            spill_dir: Parent directory for the segment files (system temp directory if None)
+        """
+        if not 0 < batch_size <= memory_limit:
+            raise ValueError("batch_size must be between 1 and memory_limit")
+        super().__init__()
+        self.memory_limit = memory_limit
+        self.batch_size = batch_size
+        self.spill_dir = spill_dir
+        # Items outside the in-memory queue, in the buffer, being written or in segment files
+        self.spilled = 0
+        self.buffer: list[str] = []
+        self.segments: deque[Path] = deque()
+        self.spill_lock: asyncio.Lock = asyncio.Lock()
+        self._directory: Optional[Path] = None
+        self._segment_count = 0
+
+    async def add(self, item: str) -> None:
+        """
+        Add an item to the queue, spilling it to disk once the in-memory queue is full.
+
+        Once items are spilled, new items go to disk too until the spill drains, to keep FIFO order.
+
+        Args:
+            item: The item to add to the queue
+        """
+        if not self.spilled and self.queue.qsize() < self.memory_limit:
+            await self.queue.put(item)
+            return
+
+        self.buffer.append(item)
+        self.spilled += 1
+        if len(self.buffer) >= self.batch_size:
+            await self._flush()
+
+    async def get_next(self) -> str:
+        """
+        Get the next item from the queue, paging spilled items back in as the in-memory queue drains.
+
+        Returns:
+            The next item from the queue
+        """
+        if self.spilled and self.queue.qsize() <= self.memory_limit - self.batch_size:
+            await self._refill()
+        return await self.queue.get()
+
+    def is_incomplete(self) -> bool:
+        """
+        Check if there are queued items in memory or on disk.
+
+        Returns:
+            True if queue is not empty, False otherwise
+        """
+        return not self.is_empty()
+
+    def is_empty(self) -> bool:
+        """
+        Check if the queue is empty, including spilled items.
+
+        Returns:
+            True if queue is empty, False otherwise
+        """
+        return self.queue.empty() and not self.spilled
+
+    def size(self) -> int:
+        """
+        Get the number of items waiting in memory and on disk.
+
+        Returns:
+            The number of queued items
+        """
+        return self.queue.qsize() + self.spilled
+
+    async def join(self) -> None:
+        """Wait until all tasks in memory and on disk are processed."""
+        while True:
+            await self.queue.join()
+            if not self.spilled:
+                return
+            await self._refill()
+
+    def close(self) -> None:
+        """Remove the segment files and their directory."""
+        if self._directory:
+            shutil.rmtree(self._directory, ignore_errors=True)
+            self._directory = None
+        self.segments.clear()
+
+    async def _flush(self) -> None:
+        """Write the buffered items to a new segment file off the event loop."""
+        async with self.spill_lock:
+            # Segments hold at most batch_size items, so a refill never overshoots the memory limit
+            while len(self.buffer) >= self.batch_size:
+                batch, self.buffer = self.buffer[:self.batch_size], self.buffer[self.batch_size:]
+                if self._directory is None:
+                    self._directory = Path(tempfile.mkdtemp(prefix="frontier-", dir=self.spill_dir))
+                self._segment_count += 1
+                path = self._directory / f"segment-{self._segment_count:06d}.txt"
+                await asyncio.to_thread(self._write_segment, path, batch)
+                self.segments.append(path)
+
+    async def _refill(self) -> None:
+        """Move the oldest spilled items, a segment file or else the buffer, into the in-memory queue."""
+        async with self.spill_lock:
+            # Other consumers may have refilled while this one waited for the lock
+            room = self.memory_limit - self.queue.qsize()
+            if self.segments:
+                if room < self.batch_size:
+                    return
+                path = self.segments.popleft()
+                items = await asyncio.to_thread(self._read_segment, path)
+            else:
+                items, self.buffer = self.buffer[:room], self.buffer[room:]
+            self.spilled -= len(items)
+            for item in items:
+                self.queue.put_nowait(item)
+
+    @staticmethod
+    def _write_segment(path: Path, items: list[str]) -> None:
+        """Write items to a segment file, one per line."""
+        path.write_text("\n".join(items) + "\n")
 
+    @staticmethod
+    def _read_segment(path: Path) -> list[str]:
+        """Read and delete a segment file."""
+        items = path.read_text().splitlines()
+        path.unlink()
+        return items
@@ -0,0 +1,210 @@
+from pathlib import Path
+from typing import Callable
+import hashlib
+import json
+import math
+import os
+import time
+
+
+class RecrawlScheduler:
+    """Schedules recurring crawls by each URL's estimated change rate, within a per-cycle fetch budget."""
+
+    # Prior observation window in seconds, so URLs fetched once are not treated as changing constantly
+    PRIOR_SECONDS = 86400.0
+
+    def __init__(
+        self,
+        path: str,
+        budget: int,
+        discovery_share: float = 0.2,
+        min_priority: float = 0.1,
+        max_attempts: int = 3,
+        clock: Callable[[], float] = time.time
+    ):
+        """
+        Initialize the scheduler.
+
+        Args:
+            path: JSON file holding the per-URL fetch history
+            budget: Maximum number of fetches in one crawl cycle
+            discovery_share: Share of the budget kept for URLs not in the history
+            min_priority: Minimum probability that a known URL changed for it to be revisited
+            max_attempts: Consecutive failed fetches after which a URL is no longer fetched
+            clock: Function returning the current time in seconds
+        """
+        if budget < 1:
+            raise ValueError("budget must be at least 1")
+        self.path = Path(path)
+        self.budget = budget
+        self.discovery_share = discovery_share
+        self.min_priority = min_priority
+        self.max_attempts = max_attempts
+        self.clock = clock
+        # URL -> {'first': first fetch, 'last': last fetch, 'hash': content hash, 'fetches': n, 'changes': n,
+        #         'failures': consecutive failed fetches}
+        self.history: dict[str, dict] = {}
+        # Discovered URLs that did not fit in the budget of a previous cycle
+        self.pending: set[str] = set()
+        # URL not in the history -> number of failed fetches
+        self.failures: dict[str, int] = {}
+        self.admitted = 0
+        self.unchanged = 0
+        self.discovered: set[str] = set()
+
+    def load(self) -> None:
+        """Load the history and pending URLs from disk if they exist."""
+        if self.path.exists():
+            state = json.loads(self.path.read_text())
+            self.history = state['history']
+            self.pending = set(state['pending'])
+            self.failures = state.get('failures', {})
+
+    def save(self) -> None:
+        """Write the history, failures and the discovered URLs still worth fetching to disk."""
+        pending = {
+            url for url in (self.pending | self.discovered) - self.history.keys()
+            if self.failures.get(url, 0) < self.max_attempts
+        }
+        # Failures are kept for dropped URLs too, so rediscovering them does not retry them
+        failures = {url: count for url, count in self.failures.items() if url not in self.history}
+        state = json.dumps({'history': self.history, 'pending': sorted(pending), 'failures': failures})
+        # Replace the file in one step, so a crash mid-write does not lose the history
+        temp_path = self.path.with_name(self.path.name + '.tmp')
+        temp_path.write_text(state)
+        os.replace(temp_path, self.path)
+
+    def change_rate(self, url: str) -> float:
+        """
+        Estimate how many times per second a known URL changes.
+
+        Args:
+            url: A URL present in the history
+
+        Returns:
+            The smoothed number of observed changes over the observed time span
+        """
+        entry = self.history[url]
+        span = entry['last'] - entry['first']
+        return (entry['changes'] + 0.5) / (span + self.PRIOR_SECONDS)
+
+    def priority(self, url: str, now: float) -> float:
+        """
+        Estimate the probability that a known URL changed since it was last fetched.
+
+        Args:
+            url: A URL present in the history
+            now: The current time in seconds
+
+        Returns:
+            A probability between 0.0 and 1.0
+        """
+        age = max(now - self.history[url]['last'], 0.0)
+        return 1.0 - math.exp(-self.change_rate(url) * age)
+
+    def seeds(self, base_url: str) -> list[str]:
+        """
+        Select the URLs a cycle starts from.
+
+        Args:
+            base_url: The URL the crawl starts from
+
+        Returns:
+            The scheduled known URLs, followed by the base URL and pending URLs if they are new
+        """
+        scheduled = self.schedule()
+        return scheduled + sorted(self.admit(self.pending | {base_url}))
+
+    def schedule(self) -> list[str]:
+        """
+        Select the known URLs to revisit in this cycle, most likely changed first.
+
+        URLs whose change probability is below `min_priority` are skipped, and the budget
+        they leave unused goes to new URLs.
+
+        Returns:
+            Up to the non-discovery share of the budget of known URLs
+        """
+        now = self.clock()
+        limit = max(int(self.budget * (1.0 - self.discovery_share)), 1)
+        priorities = {url: self.priority(url, now) for url in self.history}
+        due = [url for url, priority in priorities.items() if priority >= self.min_priority]
+        ranked = sorted(due, key=priorities.get, reverse=True)[:limit]
+        self.admitted += len(ranked)
+        return ranked
+
+    def admit(self, links: set[str]) -> set[str]:
+        """
+        Filter discovered links down to new URLs that fit in the remaining budget.
+
+        Known URLs are left to the schedule, so they are never admitted here. New URLs
+        beyond the budget are kept as pending for the next cycle.
+
+        Args:
+            links: Set of discovered links
+
+        Returns:
+            Set of new URLs to fetch in this cycle
+        """
+        admitted = set()
+        for link in links:
+            if link in self.history or link in self.discovered:
+                continue
+            if self.failures.get(link, 0) >= self.max_attempts:
+                continue
+            self.discovered.add(link)
+            if self.admitted < self.budget:
+                admitted.add(link)
+                self.admitted += 1
+        return admitted
+
+    def fail(self, url: str) -> None:
+        """
+        Record a failed fetch of a URL.
+
+        A known URL counts as fetched, so its priority starts over. After `max_attempts`
+        consecutive failures it is dropped from the history and not fetched again.
+
+        Args:
+            url: The URL that could not be fetched
+        """
+        entry = self.history.get(url)
+        if entry is None:
+            self.failures[url] = self.failures.get(url, 0) + 1
+            return
+
+        entry['last'] = self.clock()
+        entry['failures'] = entry.get('failures', 0) + 1
+        if entry['failures'] >= self.max_attempts:
+            del self.history[url]
+            self.failures[url] = entry['failures']
+
+    def observe(self, url: str, content: str) -> bool:
+        """
+        Record a fetch of a URL.
+
+        Args:
+            url: The fetched URL
+            content: The fetched content
+
+        Returns:
+            True if the URL is new or its content changed since the last fetch, False otherwise
+        """
+        now = self.clock()
+        content_hash = hashlib.blake2b(content.encode(), digest_size=16).hexdigest()
+        entry = self.history.get(url)
+        self.failures.pop(url, None)
+        if entry is None:
+            self.history[url] = {'first': now, 'last': now, 'hash': content_hash, 'fetches': 1, 'changes': 0}
+            return True
+
+        changed = entry['hash'] != content_hash
+        entry.pop('failures', None)
+        entry['last'] = now
+        entry['hash'] = content_hash
+        entry['fetches'] += 1
+        if changed:
+            entry['changes'] += 1
+        else:
+            self.unchanged += 1
+        return changed
@@ -1,56 +1,345 @@
+import argparse
 import asyncio
+import logging
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
 from client import SessionManager
-from helper import LinksExtractor, LinksDomainFilter, LinksPrinter, QueueManager
+from distributed import RemoteQueueManager
+from helper import (
+    LinksExtractor, LinksDomainFilter, LinksResourceClassifier, LinksPrinter, QueueManager, SpillingQueueManager,
+    RecrawlScheduler, ExtractionMemo, Profiler, NullProfiler, CrawlProfiler
+)
+from typing import Coroutine, Optional
 from yarl import URL
 import sys
 
 MAX_CONCURRENT_REQUESTS = 50
+PARSERS = 4
+QUEUE_SIZE = 100
+MEMO_BYTES = 16 * 1024 * 1024
+CLASSIFIER_THRESHOLD = 0.9
+REQUEST_TIMEOUT = 10
 
-async def crawl(base_url: str):
+logger = logging.getLogger(__name__)
+
+# Event loop and SessionManager settings selected with --runtime
+RUNTIME_PROFILES = {
+    'default': {
+        'uvloop': False,
+        'connection_per_fetcher': False,
+        'session': {},
+    },
+    'uvloop': {
+        'uvloop': True,
+        'connection_per_fetcher': False,
+        'session': {},
+    },
+    'tuned': {
+        'uvloop': True,
+        # limit_per_host is set to the number of fetchers
+        'connection_per_fetcher': True,
+        'session': {
+            'dns_ttl': 600,
+            'keepalive_timeout': 30,
+            # No total timeout, slow but steady responses are bounded by the read timeout instead
+            'timeout': None,
+            'connect_timeout': 5,
+            'read_timeout': 10,
+        },
+    },
+}
+
+def runtime_session_options(runtime: str, fetchers: int, **overrides) -> dict:
+    """
+    Build the SessionManager options of a runtime profile.
+
+    Args:
+        runtime: Name of the profile in RUNTIME_PROFILES
+        fetchers: Number of concurrent fetchers
+        overrides: Options that replace the profile settings, None values are ignored
+
+    Returns:
+        Keyword arguments for SessionManager
+    """
+    profile = RUNTIME_PROFILES[runtime]
+    options = {'timeout': REQUEST_TIMEOUT, **profile['session']}
+    if profile['connection_per_fetcher']:
+        options['limit_per_host'] = fetchers
+    options.update((option, value) for option, value in overrides.items() if value is not None)
+    return options
+
+def extract_links(extractor: LinksExtractor, domain_filter: LinksDomainFilter, url: str, html: str) -> set[str]:
+    """Extract the same-domain links of a page, picklable so it can run in a process pool."""
+    return domain_filter.filter(extractor.extract(url, html))
+
+async def crawl(
+    base_url: str,
+    profiler: Optional[Profiler] = None,
+    session_options: Optional[dict] = None,
+    recrawl: Optional[RecrawlScheduler] = None,
+    fetchers: int = MAX_CONCURRENT_REQUESTS,
+    parsers: int = PARSERS,
+    queue_size: int = QUEUE_SIZE,
+    executor: Optional[Executor] = None,
+    stats_interval: Optional[float] = None,
+    memo_bytes: int = MEMO_BYTES,
+    classifier_threshold: float = CLASSIFIER_THRESHOLD,
+    queue_manager: Optional[QueueManager] = None
+):
     parsed_base = URL(base_url)
     domain = parsed_base.host
+    profiler = profiler or NullProfiler()
 
     extractor = LinksExtractor()
     domain_filter = LinksDomainFilter(domain)
+    classifier = LinksResourceClassifier(threshold=classifier_threshold)
     printer = LinksPrinter()
-    queue_manager = QueueManager()
+    queue_manager = queue_manager or QueueManager()
+    memo = ExtractionMemo(max_bytes=memo_bytes) if memo_bytes else None
 
     visited = set()
-    await queue_manager.add(base_url)
-    sem = asyncio.Semaphore(MAX_CONCURRENT_REQUESTS)
-
-    async with SessionManager(timeout=10, max_connections=MAX_CONCURRENT_REQUESTS) as session_manager:
-        async def worker():
-            while queue_manager.is_incomplete():
-                url = await queue_manager.get_next_unvisited(visited)
+    if recrawl:
+        # Revisit known URLs by estimated change rate, the rest of the budget goes to new URLs
+        recrawl.load()
+        for url in recrawl.seeds(base_url):
+            await queue_manager.add(url)
+    else:
+        await queue_manager.add(base_url)
+    loop = asyncio.get_running_loop()
+    # Bounded queues between the stages, a full queue blocks the stage feeding it
+    parse_queue: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+    output_queue: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
 
-                async with sem:
+    profiler.start()
+    try:
+        async with SessionManager(
+            max_connections=fetchers,
+            on_content_type=classifier.observe,
+            **{'timeout': REQUEST_TIMEOUT, **(session_options or {})}
+        ) as session_manager:
+            async def fetcher():
+                while True:
+                    url = await queue_manager.get_next_unvisited(visited)
                     html = await session_manager.fetch(url)
                     if html is None:
-                        queue_manager.task_done()
+                        if recrawl:
+                            recrawl.fail(url)
+                        queue_manager.task_done(url)
                         continue
+                    await parse_queue.put((url, html))
+
+            async def parser():
+                while True:
+                    url, html = await parse_queue.get()
+                    try:
+                        if recrawl and not recrawl.observe(url, html):
+                            # Unchanged since the last cycle, its links are already known
+                            continue
+
+                        same_domain_links = None
+                        if memo:
+                            # Byte-identical pages in the same directory have the same links
+                            key = memo.key(url, html)
+                            same_domain_links = memo.get(key)
+                        if same_domain_links is None:
+                            if executor:
+                                same_domain_links = await loop.run_in_executor(
+                                    executor, extract_links, extractor, domain_filter, url, html
+                                )
+                            else:
+                                with profiler.stage('extract'):
+                                    links = extractor.extract(url, html)
+                                with profiler.stage('filter'):
+                                    same_domain_links = domain_filter.filter(links)
+                            if memo:
+                                memo.put(key, url, same_domain_links)
+                        with profiler.stage('filter'):
+                            new_links = classifier.filter(same_domain_links)
+                            if recrawl:
+                                new_links = recrawl.admit(new_links)
+                        await output_queue.put((url, same_domain_links))
+                        await queue_manager.add_unvisited(new_links, visited)
+                        profiler.page_done()
+                    except Exception as e:
+                        # One bad page must not take a parser out of the pool
+                        logger.warning("Failed to parse %s: %s", url, e)
+                    finally:
+                        parse_queue.task_done()
+                        queue_manager.task_done(url)
 
-                    links = extractor.extract(url, html)
-                    same_domain_links = domain_filter.filter(links)
-                    printer.print(url, same_domain_links)
-                    await queue_manager.add_unvisited(same_domain_links, visited)
+            async def writer():
+                while True:
+                    url, links = await output_queue.get()
+                    try:
+                        with profiler.stage('print'):
+                            printer.print(url, links)
+                    except Exception as e:
+                        logger.warning("Failed to print %s: %s", url, e)
+                    finally:
+                        output_queue.task_done()
 
-                queue_manager.task_done()
+            async def report():
+                while True:
+                    await asyncio.sleep(stats_interval)
+                    stats = (
+                        f"frontier={queue_manager.size()} "
+                        f"parse={parse_queue.qsize()}/{queue_size} "
+                        f"output={output_queue.qsize()}/{queue_size}"
+                    )
+                    stats += (
+                        f" skipped_by_extension={classifier.skipped_by_extension}"
+                        f" skipped_by_history={classifier.skipped_by_history}"
+                    )
+                    if memo:
+                        stats += f" memo_hit_rate={memo.hit_rate:.1%} memo_bytes={memo.bytes}"
+                    stats += (
+                        f" wire_bytes={session_manager.wire_bytes} decoded_bytes={session_manager.decoded_bytes}"
+                        f" compression={session_manager.compression_ratio:.1f}x"
+                    )
+                    print(stats, file=sys.stderr)
 
-        # Launch workers
-        workers = [asyncio.create_task(worker()) for _ in range(MAX_CONCURRENT_REQUESTS)]
-        await queue_manager.join()
-        for w in workers:
-            w.cancel()
+            # Launch the stages
+            tasks = [asyncio.create_task(fetcher()) for _ in range(fetchers)]
+            tasks += [asyncio.create_task(parser()) for _ in range(parsers)]
+            tasks.append(asyncio.create_task(writer()))
+            if stats_interval:
+                tasks.append(asyncio.create_task(report()))
+
+            try:
+                await queue_manager.join()
+                await output_queue.join()
+            finally:
+                for task in tasks:
+                    task.cancel()
+    finally:
+        queue_manager.close()
+        await profiler.stop()
+    if recrawl:
+        recrawl.save()
+
+def run(coro: Coroutine, use_uvloop: bool = False):
+    """Run a coroutine on uvloop when requested and installed, otherwise on the default asyncio loop."""
+    if use_uvloop:
+        try:
+            import uvloop
+        except ImportError:
+            print("uvloop is not installed, falling back to asyncio", file=sys.stderr)
+        else:
+            return uvloop.run(coro)
+    return asyncio.run(coro)
 
 def main():
-    if len(sys.argv) < 2:
-        print("Error: URL parameter is required")
-        print("Usage: python main.py <url>")
-        sys.exit(1)
+    parser = argparse.ArgumentParser(description="Crawl a website and print the links found on each page.")
+    parser.add_argument("url", help="The URL to start crawling from")
+    parser.add_argument("--profile", metavar="DIR", help="Write cProfile, tracemalloc and loop-lag data to DIR")
+    parser.add_argument("--profile-pages", type=int, default=500, metavar="N",
+                        help="Take a profile snapshot every N pages (default: 500)")
+    parser.add_argument("--profile-seconds", type=float, default=30.0, metavar="T",
+                        help="Take a profile snapshot every T seconds (default: 30)")
+    parser.add_argument("--runtime", choices=sorted(RUNTIME_PROFILES), default='default',
+                        help="Event loop and connector profile; 'uvloop' and 'tuned' use uvloop when installed "
+                             "(default: default)")
+    parser.add_argument("--timeout", type=float, metavar="T",
+                        help=f"Total timeout per request in seconds, 0 disables it (default: {REQUEST_TIMEOUT}, "
+                             "none for the tuned runtime)")
+    parser.add_argument("--limit-per-host", type=int, help="Maximum connections per host")
+    parser.add_argument("--dns-ttl", type=int, help="DNS cache TTL in seconds")
+    parser.add_argument("--keepalive-timeout", type=float, help="Seconds an idle connection is kept open")
+    parser.add_argument("--connect-timeout", type=float, help="Timeout for establishing a connection in seconds")
+    parser.add_argument("--read-timeout", type=float, help="Timeout between two reads of a response in seconds")
+    parser.add_argument("--recrawl", metavar="HISTORY",
+                        help="Recrawl mode: revisit URLs by estimated change rate using the history in HISTORY")
+    parser.add_argument("--budget", type=int, default=1000, metavar="N",
+                        help="Maximum number of fetches per recrawl cycle (default: 1000)")
+    parser.add_argument("--min-change-probability", type=float, default=0.1, metavar="P",
+                        help="Revisit known URLs only once they changed with probability P (default: 0.1)")
+    parser.add_argument("--fetchers", type=int, default=MAX_CONCURRENT_REQUESTS,
+                        help=f"Number of concurrent fetchers (default: {MAX_CONCURRENT_REQUESTS})")
+    parser.add_argument("--parsers", type=int, default=PARSERS, help=f"Number of parsers (default: {PARSERS})")
+    parser.add_argument("--parse-executor", choices=['thread', 'process'],
+                        help="Run link extraction in a thread or process pool of --parsers workers")
+    parser.add_argument("--queue-size", type=int, default=QUEUE_SIZE,
+                        help=f"Capacity of the queues between stages (default: {QUEUE_SIZE})")
+    parser.add_argument("--stats-interval", type=float, metavar="T",
+                        help="Print the frontier and stage queue depths to stderr every T seconds")
+    parser.add_argument("--classifier-threshold", type=float, default=CLASSIFIER_THRESHOLD, metavar="P",
+                        help="Skip links whose estimated probability of being non-HTML reaches P "
+                             f"(default: {CLASSIFIER_THRESHOLD})")
+    parser.add_argument("--memo-bytes", type=int, default=MEMO_BYTES, metavar="N",
+                        help=f"Memory cap of the extraction memo in bytes, 0 disables it (default: {MEMO_BYTES})")
+    parser.add_argument("--frontier-memory", type=int, metavar="N",
+                        help="Keep at most N frontier URLs in memory and spill the rest to disk")
+    parser.add_argument("--spill-dir", metavar="DIR", help="Directory for spilled frontier segments (default: temp dir)")
+    parser.add_argument("--coordinator", metavar="HOST:PORT",
+                        help="Share the frontier with other nodes through a distributed.coordinator process")
+    args = parser.parse_args()
+
+    runtime = RUNTIME_PROFILES[args.runtime]
+    session_options = runtime_session_options(
+        args.runtime, args.fetchers,
+        timeout=args.timeout,
+        limit_per_host=args.limit_per_host,
+        dns_ttl=args.dns_ttl,
+        keepalive_timeout=args.keepalive_timeout,
+        connect_timeout=args.connect_timeout,
+        read_timeout=args.read_timeout
+    )
+    if args.timeout == 0 or (args.timeout is None and (args.connect_timeout or args.read_timeout)):
+        # Split timeouts replace the total one, which would otherwise cap them
+        session_options['timeout'] = None
+    for option in ('connect_timeout', 'read_timeout'):
+        if session_options['timeout'] and (session_options.get(option) or 0) > session_options['timeout']:
+            parser.error(f"--{option.replace('_', '-')} cannot exceed --timeout")
 
-    url = sys.argv[1]
-    asyncio.run(crawl(url))
+    if args.profile_pages < 1:
+        parser.error("--profile-pages must be at least 1")
+    if args.profile_seconds <= 0:
+        parser.error("--profile-seconds must be positive")
+    if args.coordinator:
+        host, _, port = args.coordinator.rpartition(':')
+        if not host or not port.isdigit() or not 0 < int(port) < 65536:
+            parser.error("--coordinator must be HOST:PORT")
+
+    profiler = None
+    if args.profile:
+        profiler = CrawlProfiler(args.profile, every_pages=args.profile_pages, every_seconds=args.profile_seconds)
+    recrawl = None
+    if args.recrawl:
+        recrawl = RecrawlScheduler(args.recrawl, budget=args.budget, min_priority=args.min_change_probability)
+    executor = None
+    if args.parse_executor == 'thread':
+        executor = ThreadPoolExecutor(max_workers=args.parsers)
+    elif args.parse_executor == 'process':
+        executor = ProcessPoolExecutor(max_workers=args.parsers)
+
+    queue_manager = None
+    if args.coordinator:
+        queue_manager = RemoteQueueManager(host, int(port), batch_size=args.fetchers)
+    elif args.frontier_memory:
+        queue_manager = SpillingQueueManager(
+            memory_limit=args.frontier_memory,
+            batch_size=min(1000, args.frontier_memory),
+            spill_dir=args.spill_dir
+        )
+
+    try:
+        run(crawl(
+            args.url, profiler, session_options, recrawl,
+            fetchers=args.fetchers,
+            parsers=args.parsers,
+            queue_size=args.queue_size,
+            executor=executor,
+            stats_interval=args.stats_interval,
+            memo_bytes=args.memo_bytes,
+            classifier_threshold=args.classifier_threshold,
+            queue_manager=queue_manager
+        ), use_uvloop=runtime['uvloop'])
+    except ConnectionError as e:
+        # Exit non-zero so a supervisor notices the node stopped without finishing the crawl
+        print(f"Crawl aborted: {e}", file=sys.stderr)
+        sys.exit(1)
+    finally:
+        if executor:
+            executor.shutdown()
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -0,0 +1,75 @@
+import pytest
+from yarl import URL
+from helper.classifier import LinksResourceClassifier
+
+
+def test_classifier_drops_known_extensions():
+    """Test that links with non-HTML extensions are dropped."""
+    links = {
+        "https://example.com/report.pdf",
+        "https://example.com/logo.PNG",
+        "https://example.com/page",
+        "https://example.com/about.html"
+    }
+
+    classifier = LinksResourceClassifier()
+    result = classifier.filter(links)
+
+    assert result == {"https://example.com/page", "https://example.com/about.html"}
+    assert classifier.skipped_by_extension == 2
+    assert classifier.skipped == 2
+
+
+def test_classifier_keeps_unseen_templates():
+    """Test that links without extension or history are kept."""
+    classifier = LinksResourceClassifier()
+    result = classifier.filter({"https://example.com/media/123"})
+
+    assert result == {"https://example.com/media/123"}
+    assert classifier.skipped == 0
+
+
+def test_classifier_learns_from_content_type_history():
+    """Test that templates which keep serving non-HTML are dropped."""
+    classifier = LinksResourceClassifier(threshold=0.9)
+    for i in range(9):
+        classifier.observe(f"https://example.com/media/{i}", "image/jpeg")
+
+    result = classifier.filter({"https://example.com/media/42", "https://example.com/blog/42"})
+
+    assert result == {"https://example.com/blog/42"}
+    assert classifier.skipped_by_history == 1
+
+
+def test_classifier_below_threshold_keeps_links():
+    """Test that mixed templates stay below the threshold."""
+    classifier = LinksResourceClassifier(threshold=0.9)
+    for i in range(5):
+        classifier.observe(f"https://example.com/files/{i}", "image/png")
+        classifier.observe(f"https://example.com/files/html{i}", "text/html; charset=utf-8")
+
+    result = classifier.filter({"https://example.com/files/new"})
+
+    assert result == {"https://example.com/files/new"}
+    assert classifier.skipped == 0
+
+
+def test_classifier_template():
+    """Test that the template replaces the last path segment."""
+    assert LinksResourceClassifier.template(URL("https://example.com/media/a.jpg")) == "example.com/media/*"
+    assert LinksResourceClassifier.template(URL("https://example.com/")) == "example.com/*"
+
+
+def test_classifier_invalid_threshold():
+    """Test that an out-of-range threshold is rejected."""
+    with pytest.raises(ValueError):
+        LinksResourceClassifier(threshold=0)
+
+
+def test_classifier_counts_each_skipped_url_once():
+    """Test that a link skipped on several pages is counted once."""
+    classifier = LinksResourceClassifier()
+    classifier.filter({"https://example.com/logo.png"})
+    classifier.filter({"https://example.com/logo.png", "https://example.com/report.pdf"})
+
+    assert classifier.skipped_by_extension == 2
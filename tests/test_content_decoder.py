@@ -0,0 +1,96 @@
+import gzip
+import pytest
+import zlib
+from client.content_decoder import ContentDecoder
+
+
+def test_accept_encoding_lists_gzip_and_deflate():
+    """Test that gzip and deflate are always negotiated, with falling q-values."""
+    decoder = ContentDecoder(encodings=('gzip', 'deflate'))
+    assert decoder.accept_encoding == "gzip;q=1.0, deflate;q=0.9"
+
+
+def test_accept_encoding_prefers_brotli():
+    """Test that brotli is preferred over zstd by default."""
+    pytest.importorskip("brotli")
+    pytest.importorskip("zstandard")
+    assert ContentDecoder().accept_encoding == "br;q=1.0, zstd;q=0.9, gzip;q=0.8, deflate;q=0.7"
+    assert ContentDecoder(encodings=('zstd', 'br')).accept_encoding == "zstd;q=1.0, br;q=0.9"
+
+
+def test_unknown_encoding_is_rejected():
+    """Test that encodings the decoder cannot undo are not negotiated."""
+    with pytest.raises(ValueError):
+        ContentDecoder(encodings=('gzip', 'compress'))
+
+
+def test_decompress_identity_gzip_and_deflate():
+    """Test decompressing the standard encodings."""
+    decoder = ContentDecoder()
+    body = b"<html>Hello</html>"
+
+    assert decoder.decompress(body, "") == body
+    assert decoder.decompress(body, "identity") == body
+    assert decoder.decompress(gzip.compress(body), "gzip") == body
+    assert decoder.decompress(zlib.compress(body), "deflate") == body
+    raw = zlib.compressobj(wbits=-zlib.MAX_WBITS)
+    assert decoder.decompress(raw.compress(body) + raw.flush(), "deflate") == body
+
+
+def test_decompress_brotli():
+    """Test decompressing a brotli body."""
+    brotli = pytest.importorskip("brotli")
+    body = b"<html>Hello</html>"
+    assert ContentDecoder().decompress(brotli.compress(body), "br") == body
+
+
+def test_decompress_zstd():
+    """Test decompressing a zstd body."""
+    zstandard = pytest.importorskip("zstandard")
+    body = b"<html>Hello</html>"
+    assert ContentDecoder().decompress(zstandard.ZstdCompressor().compress(body), "zstd") == body
+
+
+def test_decompress_stacked_encodings():
+    """Test that stacked encodings are undone in reverse order of application."""
+    decoder = ContentDecoder()
+    body = b"<html>Hello</html>"
+    assert decoder.decompress(zlib.compress(gzip.compress(body)), "gzip, deflate") == body
+    assert decoder.decompress(zlib.compress(gzip.compress(body)), "deflate, gzip") is None
+
+
+def test_decompress_unsupported_or_corrupt_returns_none():
+    """Test that unknown encodings and corrupt bodies are rejected."""
+    decoder = ContentDecoder()
+    assert decoder.decompress(b"data", "compress") is None
+    assert decoder.decompress(b"not gzip", "gzip") is None
+
+
+def test_detect_charset_from_header():
+    """Test that the Content-Type charset takes precedence."""
+    decoder = ContentDecoder()
+    body = b'<html><head><meta charset="shift_jis"></head></html>'
+    assert decoder.detect_charset("text/html; charset=ISO-8859-1", body) == "iso8859-1"
+
+
+def test_detect_charset_from_meta():
+    """Test that <meta> charset declarations are used without a header charset."""
+    decoder = ContentDecoder()
+    assert decoder.detect_charset("text/html", b'<meta charset="Shift_JIS">') == "shift_jis"
+    assert decoder.detect_charset(
+        "text/html", b'<meta http-equiv="Content-Type" content="text/html; charset=windows-1252">'
+    ) == "cp1252"
+
+
+def test_detect_charset_defaults_to_utf8():
+    """Test the fallback for missing and unknown charsets."""
+    decoder = ContentDecoder()
+    assert decoder.detect_charset("text/html", b"<html></html>") == "utf-8"
+    assert decoder.detect_charset("text/html; charset=made-up", b"") == "utf-8"
+
+
+def test_decode_non_utf8_page():
+    """Test decoding a latin-1 page declared in the header."""
+    decoder = ContentDecoder()
+    body = "<html>Größe</html>".encode("latin-1")
+    assert decoder.decode(body, "text/html; charset=latin-1") == "<html>Größe</html>"
@@ -0,0 +1,191 @@
+import pytest
+import asyncio
+import sys
+from pathlib import Path
+from benchmarks.site_server import SiteServer
+from distributed.coordinator import Coordinator
+from distributed.protocol import HEADER, MAX_FRAME_BYTES, read_frame, write_frame
+from distributed.remote_queue_manager import RemoteQueueManager
+from main import crawl
+
+ROOT = Path(__file__).parent.parent
+
+
+class FakeClock:
+    """Controllable clock for lease expiry."""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.mark.asyncio
+async def test_protocol_round_trip():
+    """Test that frames survive a TCP round trip."""
+    async def echo(reader, writer):
+        await write_frame(writer, await read_frame(reader))
+        writer.close()
+
+    server = await asyncio.start_server(echo, '127.0.0.1', 0)
+    port = server.sockets[0].getsockname()[1]
+    reader, writer = await asyncio.open_connection('127.0.0.1', port)
+
+    message = {'links': ["https://example.com/ü"], 'lease': 3}
+    await write_frame(writer, message)
+    assert await read_frame(reader) == message
+    assert await read_frame(reader) is None
+
+    writer.close()
+    server.close()
+    await server.wait_closed()
+
+
+def test_coordinator_leases_batches_and_deduplicates():
+    """Test that URLs are leased in batches and only queued once."""
+    coordinator = Coordinator()
+    coordinator.add(["https://example.com/a", "https://example.com/b", "https://example.com/a"])
+
+    response = coordinator.handle({'lease': 10})
+    assert response['urls'] == ["https://example.com/a", "https://example.com/b"]
+    assert not response['finished']
+
+    response = coordinator.handle({'links': ["https://example.com/a", "https://example.com/c"], 'lease': 10})
+    assert response['urls'] == ["https://example.com/c"]
+
+
+def test_coordinator_finishes_when_all_leases_reported():
+    """Test that the crawl finishes once every leased URL is reported done."""
+    coordinator = Coordinator()
+    coordinator.add(["https://example.com/a", "https://example.com/b"])
+    lease = coordinator.handle({'lease': 2})
+
+    response = coordinator.handle({'done': {str(lease['lease']): ["https://example.com/a"]}, 'lease': 2})
+    assert response == {'lease': None, 'urls': [], 'finished': False}
+
+    response = coordinator.handle({'done': {str(lease['lease']): ["https://example.com/b"]}, 'lease': 2})
+    assert response['finished']
+    assert coordinator.completed == 2
+
+
+def test_coordinator_redelivers_expired_leases():
+    """Test that unreported URLs of an expired lease are leased again."""
+    clock = FakeClock()
+    coordinator = Coordinator(lease_ttl=10, clock=clock)
+    coordinator.add(["https://example.com/a", "https://example.com/b"])
+    lease = coordinator.handle({'lease': 2})
+    coordinator.handle({'done': {str(lease['lease']): ["https://example.com/a"]}})
+
+    clock.now = 11
+    response = coordinator.handle({'lease': 5})
+
+    assert response['urls'] == ["https://example.com/b"]
+    assert coordinator.redelivered == 1
+
+    # A late report for the expired lease is ignored
+    coordinator.handle({'done': {str(lease['lease']): ["https://example.com/b"]}})
+    assert not coordinator.finished
+
+
+@pytest.mark.asyncio
+async def test_nodes_share_frontier_in_process(capsys):
+    """Test that several crawls sharing a coordinator visit every page exactly once."""
+    coordinator = Coordinator()
+    async with SiteServer(pages=120, links_per_page=5) as server:
+        coordinator.add([server.base_url])
+        await coordinator.start()
+        nodes = [RemoteQueueManager('127.0.0.1', coordinator.port, batch_size=5, poll_interval=0.01) for _ in range(3)]
+        await asyncio.wait_for(asyncio.gather(*(
+            crawl(server.base_url, fetchers=4, parsers=2, queue_size=4, queue_manager=node) for node in nodes
+        )), timeout=30)
+        await coordinator.stop()
+
+    urls = [line.split(" ", 1)[1] for line in capsys.readouterr().out.splitlines() if line.startswith("🌐")]
+    assert len(urls) == len(set(urls))
+    assert set(urls) == set(server.page_urls())
+    assert coordinator.completed == 120
+
+
+@pytest.mark.asyncio
+async def test_crawler_processes_share_frontier():
+    """Test several main.py processes against a coordinator and the synthetic site."""
+    coordinator = Coordinator()
+    async with SiteServer(pages=200, links_per_page=5) as server:
+        coordinator.add([server.base_url])
+        await coordinator.start()
+        processes = [
+            await asyncio.create_subprocess_exec(
+                sys.executable, "main.py", server.base_url,
+                "--coordinator", f"127.0.0.1:{coordinator.port}", "--fetchers", "5",
+                cwd=ROOT, stdout=asyncio.subprocess.PIPE
+            )
+            for _ in range(3)
+        ]
+        outputs = await asyncio.wait_for(asyncio.gather(*(p.communicate() for p in processes)), timeout=60)
+        await coordinator.stop()
+
+    urls = [line.split(" ", 1)[1] for out, _ in outputs for line in out.decode().splitlines() if line.startswith("🌐")]
+    assert all(p.returncode == 0 for p in processes)
+    assert len(urls) == len(set(urls))
+    assert set(urls) == set(server.page_urls())
+
+
+@pytest.mark.asyncio
+async def test_crawl_fails_when_coordinator_stops():
+    """Test that a node stops with a ConnectionError instead of hanging when the coordinator goes away."""
+    coordinator = Coordinator()
+    async with SiteServer(pages=500, links_per_page=5, latency=0.05) as server:
+        coordinator.add([server.base_url])
+        await coordinator.start()
+        node = RemoteQueueManager('127.0.0.1', coordinator.port, batch_size=5, retries=2, retry_delay=0.01)
+        crawling = asyncio.create_task(crawl(server.base_url, fetchers=4, parsers=2, queue_manager=node))
+
+        while coordinator.completed < 10:
+            await asyncio.sleep(0.01)
+        await coordinator.stop()
+
+        with pytest.raises(ConnectionError):
+            await asyncio.wait_for(crawling, timeout=10)
+    assert not coordinator.finished
+
+
+@pytest.mark.asyncio
+async def test_crawler_process_exits_when_coordinator_stops():
+    """Test that main.py exits non-zero when the coordinator goes away mid-crawl."""
+    coordinator = Coordinator()
+    async with SiteServer(pages=500, links_per_page=5, latency=0.05) as server:
+        coordinator.add([server.base_url])
+        await coordinator.start()
+        process = await asyncio.create_subprocess_exec(
+            sys.executable, "main.py", server.base_url,
+            "--coordinator", f"127.0.0.1:{coordinator.port}", "--fetchers", "5",
+            cwd=ROOT, stdout=asyncio.subprocess.DEVNULL, stderr=asyncio.subprocess.PIPE
+        )
+
+        while coordinator.completed < 10:
+            await asyncio.sleep(0.01)
+        await coordinator.stop()
+        _, stderr = await asyncio.wait_for(process.communicate(), timeout=30)
+
+    assert process.returncode == 1
+    assert b"Crawl aborted" in stderr
+
+
+@pytest.mark.asyncio
+async def test_crawl_fails_on_corrupt_coordinator_frames():
+    """Test that oversized frames from the coordinator fail the crawl instead of killing fetchers silently."""
+    async def corrupt(reader, writer):
+        await reader.read(HEADER.size)
+        writer.write(HEADER.pack(MAX_FRAME_BYTES + 1))
+        await writer.drain()
+        writer.close()
+
+    server = await asyncio.start_server(corrupt, '127.0.0.1', 0)
+    port = server.sockets[0].getsockname()[1]
+    node = RemoteQueueManager('127.0.0.1', port, batch_size=5, retries=1, retry_delay=0.01)
+    with pytest.raises(ConnectionError):
+        await asyncio.wait_for(crawl("http://127.0.0.1:1/page/0", fetchers=2, parsers=1, queue_manager=node), timeout=10)
+
+    server.close()
+    await server.wait_closed()
@@ -0,0 +1,105 @@
+import asyncio
+import pytest
+from concurrent.futures import ThreadPoolExecutor
+from benchmarks.site_server import SiteServer
+from helper.queue_manager import SpillingQueueManager
+from helper.extractor import LinksExtractor
+from client import SessionManager
+from main import crawl, main, runtime_session_options
+
+
+def crawled_urls(output: str) -> list[str]:
+    """Return the page URLs printed by LinksPrinter."""
+    return [line.split(" ", 1)[1] for line in output.splitlines() if line.startswith("🌐")]
+
+
+@pytest.mark.asyncio
+async def test_crawl_visits_every_page_once(capsys):
+    """Test that the pipeline fetches and prints every reachable page once."""
+    async with SiteServer(pages=60, links_per_page=5) as server:
+        await crawl(server.base_url, fetchers=8, parsers=2, queue_size=4)
+
+    urls = crawled_urls(capsys.readouterr().out)
+    assert len(urls) == len(set(urls))
+    assert set(urls) == set(server.page_urls())
+
+
+@pytest.mark.asyncio
+async def test_crawl_with_parse_executor(capsys):
+    """Test that extraction can run in an executor."""
+    async with SiteServer(pages=30, links_per_page=3) as server:
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            await crawl(server.base_url, fetchers=4, parsers=2, queue_size=2, executor=executor)
+
+    assert set(crawled_urls(capsys.readouterr().out)) == set(server.page_urls())
+
+
+@pytest.mark.asyncio
+async def test_crawl_with_spilling_frontier(capsys, tmp_path):
+    """Test that a frontier spilling to disk still visits every page."""
+    queue_manager = SpillingQueueManager(memory_limit=10, batch_size=5, spill_dir=str(tmp_path))
+    async with SiteServer(pages=80, links_per_page=6) as server:
+        await crawl(server.base_url, fetchers=4, parsers=2, queue_size=4, queue_manager=queue_manager)
+    queue_manager.close()
+
+    assert set(crawled_urls(capsys.readouterr().out)) == set(server.page_urls())
+
+
+@pytest.mark.asyncio
+async def test_crawl_survives_pages_that_fail_extraction(capsys, mocker):
+    """Test that pages failing extraction are skipped without stopping the parsers."""
+    extract = LinksExtractor.extract
+
+    def failing_extract(self, base_url, content):
+        if base_url.endswith(("/1", "/2", "/3", "/4", "/5")):
+            raise ValueError("Regex extraction failed: found <a> tags but no href matches")
+        return extract(self, base_url, content)
+
+    mocker.patch.object(LinksExtractor, 'extract', autospec=True, side_effect=failing_extract)
+    async with SiteServer(pages=40, links_per_page=5) as server:
+        await asyncio.wait_for(crawl(server.base_url, fetchers=4, parsers=2, queue_size=2), timeout=10)
+
+    urls = crawled_urls(capsys.readouterr().out)
+    assert server.base_url in urls
+    assert not any(url.endswith(("/1", "/2", "/3", "/4", "/5")) for url in urls)
+
+
+def test_runtime_session_options():
+    """Test that the tuned profile allows one connection per fetcher and overrides replace profile settings."""
+    assert runtime_session_options('default', 8) == {'timeout': 10}
+
+    options = runtime_session_options('tuned', 8, read_timeout=15, dns_ttl=None)
+    assert options['limit_per_host'] == 8
+    assert options['timeout'] is None
+    assert options['read_timeout'] == 15
+    assert options['dns_ttl'] == 600
+
+
+def test_read_timeout_above_default_total_is_honoured(mocker):
+    """Test that --read-timeout is not capped by the default total timeout."""
+    mocker.patch('main.run')
+    crawl_mock = mocker.patch('main.crawl', new=mocker.MagicMock())
+    mocker.patch('sys.argv', ['main.py', 'https://example.com', '--read-timeout', '30'])
+    main()
+
+    session_options = crawl_mock.call_args.args[2]
+    timeout = SessionManager(**session_options).timeout
+    assert timeout.total is None
+    assert timeout.sock_read == 30
+
+
+def test_read_timeout_above_total_is_rejected(mocker):
+    """Test that a read timeout longer than an explicit total timeout is an error."""
+    mocker.patch('main.run')
+    mocker.patch('sys.argv', ['main.py', 'https://example.com', '--timeout', '10', '--read-timeout', '30'])
+    with pytest.raises(SystemExit):
+        main()
+
+
+def test_invalid_coordinator_is_rejected(mocker):
+    """Test that --coordinator values without a valid port are a usage error."""
+    mocker.patch('main.run')
+    for coordinator in ("127.0.0.1", "127.0.0.1:port", ":9000", "127.0.0.1:70000"):
+        mocker.patch('sys.argv', ['main.py', 'https://example.com', '--coordinator', coordinator])
+        with pytest.raises(SystemExit):
+            main()
@@ -0,0 +1,69 @@
+from helper.memo import ExtractionMemo
+
+
+def test_memo_hit_for_identical_content_in_same_directory():
+    """Test that identical pages in the same directory share the memo entry."""
+    memo = ExtractionMemo()
+    html = '<html><a href="next">Next</a></html>'
+    links = {"https://example.com/list/next"}
+
+    key = memo.key("https://example.com/list/a", html)
+    assert memo.get(key) is None
+    memo.put(key, "https://example.com/list/a", links)
+
+    assert memo.get(memo.key("https://example.com/list/b", html)) == links
+    assert memo.hits == 1
+    assert memo.misses == 1
+    assert memo.hit_rate == 0.5
+
+
+def test_memo_miss_for_other_directory():
+    """Test that the same content in another directory is not shared."""
+    memo = ExtractionMemo()
+    html = '<html><a href="next">Next</a></html>'
+    memo.put(memo.key("https://example.com/a/page", html), "https://example.com/a/page", {"https://example.com/a/next"})
+
+    assert memo.get(memo.key("https://example.com/b/page", html)) is None
+
+
+def test_memo_evicts_least_recently_used_over_byte_cap():
+    """Test that entries are evicted by bytes, least recently used first."""
+    memo = ExtractionMemo(max_bytes=2000)
+    keys = []
+    for i in range(10):
+        key = memo.key(f"https://example.com/{i}/page", f"<html>{i}</html>")
+        memo.put(key, f"https://example.com/{i}/page", {f"https://example.com/{i}/link{n}" for n in range(3)})
+        keys.append(key)
+
+    assert memo.bytes <= 2000
+    assert memo.get(keys[0]) is None
+    assert memo.get(keys[-1]) is not None
+
+
+def test_memo_skips_pages_with_query_only_links():
+    """Test that links resolved against the file name are not memoized."""
+    memo = ExtractionMemo()
+    key = memo.key("https://example.com/list", "<html></html>")
+    memo.put(key, "https://example.com/list", {"https://example.com/list?page=2"})
+
+    assert memo.get(key) is None
+    assert memo.bytes == 0
+
+
+def test_memo_skips_pages_linking_to_themselves():
+    """Test that a bare '?' link, which resolves to the page URL, is not memoized."""
+    memo = ExtractionMemo()
+    html = '<html><a href="?">Reload</a></html>'
+    memo.put(memo.key("https://e.com/d/a", html), "https://e.com/d/a", {"https://e.com/d/a"})
+
+    assert memo.get(memo.key("https://e.com/d/b", html)) is None
+    assert memo.bytes == 0
+
+
+def test_memo_stores_directory_index_pages():
+    """Test that links below an index page's directory do not prevent memoization."""
+    memo = ExtractionMemo()
+    key = memo.key("https://e.com/d/", "<html></html>")
+    memo.put(key, "https://e.com/d/", {"https://e.com/d/a"})
+
+    assert memo.get(key) == {"https://e.com/d/a"}
@@ -0,0 +1,61 @@
+import pytest
+import asyncio
+import time
+from helper.profiler import NullProfiler, CrawlProfiler
+
+
+@pytest.mark.asyncio
+async def test_null_profiler_is_noop():
+    """Test that NullProfiler accepts all calls without side effects."""
+    profiler = NullProfiler()
+    profiler.start()
+    with profiler.stage('extract'):
+        pass
+    profiler.page_done()
+    await profiler.stop()
+
+
+@pytest.mark.asyncio
+async def test_crawl_profiler_writes_snapshots_every_n_pages(tmp_path):
+    """Test that a snapshot is written every N pages and on stop."""
+    profiler = CrawlProfiler(str(tmp_path), every_pages=2, every_seconds=3600, lag_interval=0.01)
+    profiler.start()
+    for _ in range(2):
+        profiler.page_done()
+    # The snapshot is taken by the probe, not inside page_done
+    assert profiler.snapshots == 0
+    await asyncio.sleep(0.1)
+    await profiler.stop()
+
+    assert profiler.snapshots == 2
+    assert (tmp_path / "profile-0001.prof").exists()
+    assert (tmp_path / "alloc-0001.txt").read_text().startswith("pages=2")
+    assert (tmp_path / "profile-0002.prof").exists()
+    assert (tmp_path / "loop-lag.txt").exists()
+
+
+@pytest.mark.asyncio
+async def test_crawl_profiler_attributes_loop_lag_to_stage(tmp_path):
+    """Test that a blocked event loop is attributed to the running stage."""
+    profiler = CrawlProfiler(str(tmp_path), every_seconds=3600, lag_interval=0.01, lag_threshold=0.05)
+    profiler.start()
+    await asyncio.sleep(0.02)
+
+    with profiler.stage('extract'):
+        time.sleep(0.1)
+    await asyncio.sleep(0.05)
+    await profiler.stop()
+
+    assert 'extract' in profiler.blocks
+    count, total, worst = profiler.blocks['extract']
+    assert count == 1
+    assert worst >= 0.05
+    assert 'extract' in (tmp_path / "loop-lag.txt").read_text()
+
+
+def test_crawl_profiler_rejects_invalid_intervals(tmp_path):
+    """Test that snapshot intervals must be positive."""
+    with pytest.raises(ValueError):
+        CrawlProfiler(str(tmp_path), every_pages=0)
+    with pytest.raises(ValueError):
+        CrawlProfiler(str(tmp_path), every_seconds=0)
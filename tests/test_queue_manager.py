@@ -1,6 +1,6 @@
 import pytest
 import asyncio
-from helper.queue_manager import QueueManager
+from helper.queue_manager import QueueManager, SpillingQueueManager
 
 
 @pytest.mark.asyncio
@@ -286,3 +286,122 @@ async def test_complex_workflow():
     # Join should complete
     await asyncio.wait_for(queue_manager.join(), timeout=0.1)
 
+
+@pytest.mark.asyncio
+async def test_size():
+    """Test that size reports the number of queued items."""
+    queue_manager = QueueManager()
+    assert queue_manager.size() == 0
+
+    await queue_manager.add("https://example.com/page1")
+    await queue_manager.add("https://example.com/page2")
+    assert queue_manager.size() == 2
+
+
+@pytest.mark.asyncio
+async def test_spilling_queue_manager_spills_and_keeps_fifo_order(tmp_path):
+    """Test that items beyond the memory limit go to disk and come back in order."""
+    queue_manager = SpillingQueueManager(memory_limit=4, batch_size=2, spill_dir=str(tmp_path))
+    urls = [f"https://example.com/page{i}" for i in range(11)]
+
+    for url in urls:
+        await queue_manager.add(url)
+
+    assert queue_manager.queue.qsize() == 4
+    assert queue_manager.spilled == 7
+    assert queue_manager.size() == 11
+    assert len(list(tmp_path.glob("frontier-*/segment-*.txt"))) == 3
+
+    retrieved = []
+    while not queue_manager.is_empty():
+        retrieved.append(await queue_manager.get_next())
+        queue_manager.task_done()
+        assert queue_manager.queue.qsize() <= 4
+
+    assert retrieved == urls
+    await asyncio.wait_for(queue_manager.join(), timeout=0.1)
+    queue_manager.close()
+    assert list(tmp_path.iterdir()) == []
+
+
+@pytest.mark.asyncio
+async def test_spilling_queue_manager_join_waits_for_spilled_items(tmp_path):
+    """Test that join does not return while spilled items are unprocessed."""
+    queue_manager = SpillingQueueManager(memory_limit=1, batch_size=1, spill_dir=str(tmp_path))
+    await queue_manager.add("https://example.com/page1")
+    await queue_manager.add("https://example.com/page2")
+
+    await queue_manager.get_next()
+    queue_manager.task_done()
+
+    with pytest.raises(asyncio.TimeoutError):
+        await asyncio.wait_for(queue_manager.join(), timeout=0.1)
+
+    assert await queue_manager.get_next() == "https://example.com/page2"
+    queue_manager.task_done()
+    await asyncio.wait_for(queue_manager.join(), timeout=0.1)
+    queue_manager.close()
+
+
+@pytest.mark.asyncio
+async def test_spilling_queue_manager_concurrent_workflow(tmp_path):
+    """Test that concurrent producers and consumers see every item exactly once."""
+    queue_manager = SpillingQueueManager(memory_limit=8, batch_size=4, spill_dir=str(tmp_path))
+    visited = set()
+    received = []
+
+    async def consumer():
+        while True:
+            received.append(await queue_manager.get_next_unvisited(visited))
+            queue_manager.task_done()
+
+    consumers = [asyncio.create_task(consumer()) for _ in range(3)]
+    for start in range(0, 100, 10):
+        await queue_manager.add_unvisited({f"https://example.com/page{i}" for i in range(start, start + 10)}, visited)
+
+    await asyncio.wait_for(queue_manager.join(), timeout=1)
+    for task in consumers:
+        task.cancel()
+    queue_manager.close()
+
+    assert sorted(received) == sorted(f"https://example.com/page{i}" for i in range(100))
+
+
+def test_spilling_queue_manager_invalid_batch_size():
+    """Test that a batch larger than the memory limit is rejected."""
+    with pytest.raises(ValueError):
+        SpillingQueueManager(memory_limit=2, batch_size=3)
+
+
+@pytest.mark.asyncio
+async def test_spilling_queue_manager_enforces_memory_limit_with_concurrent_consumers(tmp_path):
+    """Test that concurrent consumers do not page in more than the memory limit."""
+    queue_manager = SpillingQueueManager(memory_limit=10, batch_size=10, spill_dir=str(tmp_path))
+    peak = 0
+    put_nowait = queue_manager.queue.put_nowait
+
+    def tracking_put_nowait(item):
+        nonlocal peak
+        put_nowait(item)
+        peak = max(peak, queue_manager.queue.qsize())
+
+    queue_manager.queue.put_nowait = tracking_put_nowait
+    for i in range(500):
+        await queue_manager.add(f"https://example.com/page{i}")
+
+    received = []
+
+    async def consumer():
+        while True:
+            received.append(await queue_manager.get_next())
+            await asyncio.sleep(0)
+            queue_manager.task_done()
+
+    consumers = [asyncio.create_task(consumer()) for _ in range(50)]
+    await asyncio.wait_for(queue_manager.join(), timeout=5)
+    for task in consumers:
+        task.cancel()
+    queue_manager.close()
+
+    assert peak <= queue_manager.memory_limit
+    assert sorted(received) == sorted(f"https://example.com/page{i}" for i in range(500))
@@ -0,0 +1,161 @@
+import pytest
+from helper.recrawl import RecrawlScheduler
+
+
+class FakeClock:
+    """Controllable clock for the scheduler."""
+
+    def __init__(self):
+        self.now = 1_000_000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_observe_detects_new_and_changed_content(tmp_path):
+    """Test that observe reports new and changed pages."""
+    scheduler = RecrawlScheduler(str(tmp_path / "history.json"), budget=10)
+
+    assert scheduler.observe("https://example.com", "<html>v1</html>")
+    assert not scheduler.observe("https://example.com", "<html>v1</html>")
+    assert scheduler.observe("https://example.com", "<html>v2</html>")
+
+    entry = scheduler.history["https://example.com"]
+    assert entry['fetches'] == 3
+    assert entry['changes'] == 1
+    assert scheduler.unchanged == 1
+
+
+def test_schedule_prefers_frequently_changing_pages(tmp_path):
+    """Test that frequently changing pages are scheduled before static ones."""
+    clock = FakeClock()
+    scheduler = RecrawlScheduler(str(tmp_path / "history.json"), budget=10, clock=clock)
+
+    for i in range(5):
+        scheduler.observe("https://example.com/news", f"<html>{i}</html>")
+        scheduler.observe("https://example.com/about", "<html>about</html>")
+        clock.now += 3600
+
+    assert scheduler.priority("https://example.com/news", clock.now) > \
+        scheduler.priority("https://example.com/about", clock.now)
+    assert scheduler.schedule()[0] == "https://example.com/news"
+
+
+def test_schedule_respects_discovery_share(tmp_path):
+    """Test that known URLs leave part of the budget to new URLs."""
+    clock = FakeClock()
+    scheduler = RecrawlScheduler(str(tmp_path / "history.json"), budget=10, discovery_share=0.2, clock=clock)
+    for i in range(20):
+        scheduler.observe(f"https://example.com/page{i}", "<html></html>")
+    clock.now += 30 * 86400
+
+    assert len(scheduler.schedule()) == 8
+    admitted = scheduler.admit({f"https://example.com/new{i}" for i in range(5)})
+    assert len(admitted) == 2
+
+
+def test_admit_skips_known_urls_and_keeps_overflow_pending(tmp_path):
+    """Test that admit only returns new URLs and stops at the budget."""
+    path = tmp_path / "history.json"
+    scheduler = RecrawlScheduler(str(path), budget=2)
+    scheduler.observe("https://example.com/known", "<html></html>")
+
+    admitted = scheduler.admit({"https://example.com/known", "https://example.com/a", "https://example.com/b", "https://example.com/c"})
+
+    assert "https://example.com/known" not in admitted
+    assert len(admitted) == 2
+    assert scheduler.admit({"https://example.com/a"}) == set()
+
+    scheduler.save()
+    reloaded = RecrawlScheduler(str(path), budget=2)
+    reloaded.load()
+    assert set(reloaded.history) == {"https://example.com/known"}
+    assert reloaded.pending == {"https://example.com/a", "https://example.com/b", "https://example.com/c"}
+
+
+def test_seeds_start_from_base_url_on_first_cycle(tmp_path):
+    """Test that an empty history starts from the base URL."""
+    scheduler = RecrawlScheduler(str(tmp_path / "history.json"), budget=5)
+    scheduler.load()
+
+    assert scheduler.seeds("https://example.com") == ["https://example.com"]
+
+
+def test_invalid_budget(tmp_path):
+    """Test that a budget below 1 is rejected."""
+    with pytest.raises(ValueError):
+        RecrawlScheduler(str(tmp_path / "history.json"), budget=0)
+
+
+def test_schedule_skips_pages_unlikely_to_have_changed(tmp_path):
+    """Test that recently fetched static pages are not revisited and leave the budget to new URLs."""
+    clock = FakeClock()
+    scheduler = RecrawlScheduler(str(tmp_path / "history.json"), budget=1000, min_priority=0.1, clock=clock)
+    for i in range(100):
+        scheduler.observe(f"https://example.com/page{i}", "<html></html>")
+    clock.now += 3600
+
+    assert scheduler.schedule() == []
+    assert len(scheduler.admit({f"https://example.com/new{i}" for i in range(1000)})) == 1000
+
+
+def test_failed_new_urls_are_dropped_after_max_attempts(tmp_path):
+    """Test that new URLs which keep failing stop being kept as pending."""
+    path = tmp_path / "history.json"
+    for _ in range(3):
+        scheduler = RecrawlScheduler(str(path), budget=5, max_attempts=3)
+        scheduler.load()
+        assert scheduler.seeds("https://example.com/broken") == ["https://example.com/broken"]
+        scheduler.fail("https://example.com/broken")
+        scheduler.save()
+
+    scheduler = RecrawlScheduler(str(path), budget=5, max_attempts=3)
+    scheduler.load()
+    assert scheduler.pending == set()
+    assert scheduler.seeds("https://example.com/broken") == []
+
+
+def test_failing_known_url_backs_off_and_is_dropped(tmp_path):
+    """Test that a known URL which keeps failing does not stay at the top of every cycle."""
+    path = tmp_path / "history.json"
+    clock = FakeClock()
+    scheduler = RecrawlScheduler(str(path), budget=10, max_attempts=3, clock=clock)
+    for i in range(5):
+        scheduler.observe("https://example.com/live", f"<html>{i}</html>")
+        scheduler.observe("https://example.com/gone", f"<html>{i}</html>")
+        clock.now += 3600
+    scheduler.save()
+
+    scheduled = []
+    for _ in range(5):
+        clock.now += 86400
+        scheduler = RecrawlScheduler(str(path), budget=10, max_attempts=3, clock=clock)
+        scheduler.load()
+        seeds = scheduler.seeds("https://example.com/live")
+        scheduled.append(seeds)
+        if "https://example.com/gone" in seeds:
+            scheduler.fail("https://example.com/gone")
+        scheduler.observe("https://example.com/live", f"<html>{clock.now}</html>")
+        scheduler.save()
+
+    assert all(seeds[0] == "https://example.com/live" for seeds in scheduled)
+    assert sum("https://example.com/gone" in seeds for seeds in scheduled) == 3
+    assert "https://example.com/gone" not in scheduler.history
+    assert scheduler.seeds("https://example.com/gone") == []
+
+
+def test_save_keeps_previous_history_when_interrupted(tmp_path, mocker):
+    """Test that a failed save leaves the previous history file intact."""
+    path = tmp_path / "history.json"
+    scheduler = RecrawlScheduler(str(path), budget=10)
+    scheduler.observe("https://example.com", "<html>v1</html>")
+    scheduler.save()
+
+    scheduler.observe("https://example.com/new", "<html>new</html>")
+    mocker.patch('helper.recrawl.os.replace', side_effect=OSError("killed"))
+    with pytest.raises(OSError):
+        scheduler.save()
+
+    scheduler = RecrawlScheduler(str(path), budget=10)
+    scheduler.load()
+    assert set(scheduler.history) == {"https://example.com"}
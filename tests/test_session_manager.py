@@ -1,4 +1,7 @@
+import gzip
 import pytest
+import zlib
+from benchmarks.site_server import SiteServer
 from client.session_manager import SessionManager
 
 
@@ -33,7 +36,7 @@ async def test_fetch_returns_html(mocker):
     mock_response = mocker.AsyncMock()
     mock_response.status = 200
     mock_response.headers = {'Content-Type': 'text/html; charset=utf-8'}
-    mock_response.text = mocker.AsyncMock(return_value="<html><body>Test</body></html>")
+    mock_response.read = mocker.AsyncMock(return_value=b"<html><body>Test</body></html>")
     mock_response.__aenter__ = mocker.AsyncMock(return_value=mock_response)
     mock_response.__aexit__ = mocker.AsyncMock(return_value=None)
 
@@ -86,3 +89,76 @@ async def test_fetch_returns_none_on_exception(mocker):
     assert result is None
 
 
+@pytest.mark.asyncio
+async def test_fetch_reports_content_type(mocker):
+    """Test that fetch reports the response Content-Type to the callback."""
+    mock_response = mocker.AsyncMock()
+    mock_response.status = 200
+    mock_response.headers = {'Content-Type': 'image/jpeg'}
+    mock_response.__aenter__ = mocker.AsyncMock(return_value=mock_response)
+    mock_response.__aexit__ = mocker.AsyncMock(return_value=None)
+    on_content_type = mocker.Mock()
+
+    async with SessionManager(timeout=10, on_content_type=on_content_type) as manager:
+        manager.session.get = mocker.Mock(return_value=mock_response)
+        result = await manager.fetch("https://example.com/media/1")
+
+    assert result is None
+    on_content_type.assert_called_once_with("https://example.com/media/1", "image/jpeg")
+
+
+@pytest.mark.asyncio
+async def test_session_manager_connector_settings():
+    """Test that connector and timeout settings are applied to the session."""
+    manager = SessionManager(
+        timeout=10,
+        max_connections=20,
+        limit_per_host=5,
+        keepalive_timeout=30,
+        connect_timeout=2,
+        read_timeout=4
+    )
+    async with manager:
+        connector = manager.session.connector
+        assert connector.limit == 20
+        assert connector.limit_per_host == 5
+    assert manager.timeout.total == 10
+    assert manager.timeout.sock_connect == 2
+    assert manager.timeout.sock_read == 4
+
+
+@pytest.mark.asyncio
+async def test_fetch_decompresses_and_decodes_charset(mocker):
+    """Test that fetch decompresses the body, decodes its charset and counts bytes."""
+    html = "<html><body>Größe</body></html>"
+    body = gzip.compress(html.encode("latin-1"))
+    mock_response = mocker.AsyncMock()
+    mock_response.status = 200
+    mock_response.headers = {'Content-Type': 'text/html; charset=latin-1', 'Content-Encoding': 'gzip'}
+    mock_response.read = mocker.AsyncMock(return_value=body)
+    mock_response.__aenter__ = mocker.AsyncMock(return_value=mock_response)
+    mock_response.__aexit__ = mocker.AsyncMock(return_value=None)
+
+    async with SessionManager(timeout=10) as manager:
+        manager.session.get = mocker.Mock(return_value=mock_response)
+        result = await manager.fetch("https://example.com")
+
+    assert result == html
+    assert manager.wire_bytes == len(body)
+    assert manager.decoded_bytes == len(html.encode("latin-1"))
+    assert manager.compression_ratio == manager.decoded_bytes / manager.wire_bytes
+
+
+@pytest.mark.asyncio
+async def test_fetch_negotiates_preferred_encoding():
+    """Test that the server picks the encoding by the q-values SessionManager sends."""
+    assert SiteServer.negotiate("gzip;q=0.5, deflate;q=0.9") == "deflate"
+    assert SiteServer.negotiate("gzip, deflate") == "gzip"
+    assert SiteServer.negotiate("compress") == "identity"
+
+    async with SiteServer(pages=1, compress=True) as server:
+        async with SessionManager(timeout=10, encodings=('deflate', 'gzip')) as manager:
+            html = await manager.fetch(server.base_url)
+
+    assert "Page 0" in html
+    assert manager.wire_bytes == server.wire_bytes == len(zlib.compress(server.render(0).encode()))